@@ -52,6 +52,11 @@ if CHAIRMAN_MODEL in COUNCIL_MODELS:
         "in Stage 1 (first-opinion generation) or Stage 2 (peer review)."
     )
 
+# Optional SQLite file caching LLM responses by (model, messages), so repeated
+# development runs of the same proposal skip the API calls. Unset disables it;
+# leave it unset in production, where fresh responses are expected.
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+
 # OpenRouter API endpoint
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
@@ -67,6 +72,10 @@ DATA_DIR = "data/conversations"
 # Minimum: 3 iterations, Optimal: 7-10 iterations
 BOOTSTRAP_ITERATIONS = 5
 
+# Bootstrap iterations whose ranking requests are in flight at once
+# (each iteration sends one request per council model)
+BOOTSTRAP_MAX_CONCURRENT_ITERATIONS = int(os.getenv("BOOTSTRAP_MAX_CONCURRENT_ITERATIONS", "5"))
+
 # Enable bootstrap evaluation contexts (set to False to use original single evaluation)
 ENABLE_BOOTSTRAP_EVALUATION = True
 
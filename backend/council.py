@@ -1,6 +1,8 @@
 """3-stage LLM Council orchestration with bootstrap evaluation contexts and direct API support."""
 
+import asyncio
 import random
+import re
 from typing import List, Dict, Any, Tuple, Optional
 from collections import defaultdict
 from .config import (
@@ -8,6 +10,7 @@ from .config import (
     CHAIRMAN_MODEL,
     ENABLE_BOOTSTRAP_EVALUATION,
     BOOTSTRAP_ITERATIONS,
+    BOOTSTRAP_MAX_CONCURRENT_ITERATIONS,
     EVALUATION_CRITERIA,
     BOOTSTRAP_AGGREGATION_METHOD,
     USE_DIRECT_APIS
@@ -122,7 +125,6 @@ Retrieved Context:
         tasks.append(query_model(model, messages))
         model_list.append(model)
     
-    import asyncio
     responses_list = await asyncio.gather(*tasks, return_exceptions=True)
     
     # Format results
@@ -403,12 +405,18 @@ Now provide your evaluation and ranking:"""
     if BOOTSTRAP_ITERATIONS > len(EVALUATION_CRITERIA):
         criteria_to_use = (EVALUATION_CRITERIA * ((BOOTSTRAP_ITERATIONS // len(EVALUATION_CRITERIA)) + 1))[:BOOTSTRAP_ITERATIONS]
     
-    # Run bootstrap iterations
-    for iteration in range(BOOTSTRAP_ITERATIONS):
+    # Vary response order for each iteration. Orders are drawn up front, in
+    # iteration order, so they don't depend on which request finishes first
+    shuffled_orders = [
+        _shuffle_responses_order(labels.copy(), stage1_results.copy())
+        for _ in range(BOOTSTRAP_ITERATIONS)
+    ]
+    
+    semaphore = asyncio.Semaphore(BOOTSTRAP_MAX_CONCURRENT_ITERATIONS)
+    
+    async def run_iteration(iteration: int) -> Dict[str, Any]:
         criterion = criteria_to_use[iteration]
-        
-        # Vary response order for each iteration
-        shuffled_labels, shuffled_results = _shuffle_responses_order(labels.copy(), stage1_results.copy())
+        shuffled_labels, shuffled_results = shuffled_orders[iteration]
         
         # Build responses text with shuffled order
         responses_text = "\n\n".join([
@@ -422,7 +430,17 @@ Now provide your evaluation and ranking:"""
         messages = [{"role": "user", "content": ranking_prompt}]
         
         # Get rankings from all council models in parallel for this iteration
-        responses = await query_models_parallel(COUNCIL_MODELS, messages)
+        async with semaphore:
+            return await query_models_parallel(COUNCIL_MODELS, messages)
+    
+    # Run bootstrap iterations concurrently (each is one request per council model)
+    iteration_responses = await asyncio.gather(
+        *(run_iteration(iteration) for iteration in range(BOOTSTRAP_ITERATIONS))
+    )
+    
+    for iteration, responses in enumerate(iteration_responses):
+        criterion = criteria_to_use[iteration]
+        shuffled_labels, _ = shuffled_orders[iteration]
         
         # Store results with iteration metadata
         for model, response in responses.items():
@@ -622,8 +640,6 @@ def parse_ranking_from_text(ranking_text: str) -> List[str]:
     Returns:
         List of response labels in ranked order
     """
-    import re
-
     # Look for "FINAL RANKING:" section
     if "FINAL RANKING:" in ranking_text:
         # Extract everything after "FINAL RANKING:"
@@ -660,8 +676,6 @@ def calculate_aggregate_rankings(
     Returns:
         List of dicts with model name and average rank, sorted best to worst
     """
-    from collections import defaultdict
-
     # Track positions for each model
     model_positions = defaultdict(list)
 
@@ -1,9 +1,10 @@
 """Direct API clients for Anthropic, Google, and xAI (bypassing OpenRouter)."""
 
 import os
-import httpx
 from typing import List, Dict, Any, Optional
 import asyncio
+from .http_client import post_with_retry
+from .llm_cache import cached_response
 
 
 # API Keys from environment
@@ -50,19 +51,18 @@ async def query_anthropic(
         payload["system"] = system_message
     
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                "https://api.anthropic.com/v1/messages",
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                'content': data['content'][0]['text'],
-                'model': model
-            }
+        response = await post_with_retry(
+            "https://api.anthropic.com/v1/messages",
+            headers=headers,
+            json=payload,
+            timeout=timeout
+        )
+        data = response.json()
+        
+        return {
+            'content': data['content'][0]['text'],
+            'model': model
+        }
     except Exception as e:
         print(f"Error querying Anthropic {model}: {e}")
         return None
@@ -93,15 +93,13 @@ async def query_google(
     }
     
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(url, json=payload)
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                'content': data['candidates'][0]['content']['parts'][0]['text'],
-                'model': model
-            }
+        response = await post_with_retry(url, json=payload, timeout=timeout)
+        data = response.json()
+        
+        return {
+            'content': data['candidates'][0]['content']['parts'][0]['text'],
+            'model': model
+        }
     except Exception as e:
         print(f"Error querying Google {model}: {e}")
         return None
@@ -129,19 +127,18 @@ async def query_xai(
     }
     
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                "https://api.x.ai/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                'content': data['choices'][0]['message']['content'],
-                'model': model
-            }
+        response = await post_with_retry(
+            "https://api.x.ai/v1/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=timeout
+        )
+        data = response.json()
+        
+        return {
+            'content': data['choices'][0]['message']['content'],
+            'model': model
+        }
     except Exception as e:
         print(f"Error querying xAI {model}: {e}")
         return None
@@ -168,19 +165,18 @@ async def query_openai(
     }
     
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            return {
-                'content': data['choices'][0]['message']['content'],
-                'model': model
-            }
+        response = await post_with_retry(
+            "https://api.openai.com/v1/chat/completions",
+            headers=headers,
+            json=payload,
+            timeout=timeout
+        )
+        data = response.json()
+        
+        return {
+            'content': data['choices'][0]['message']['content'],
+            'model': model
+        }
     except Exception as e:
         print(f"Error querying OpenAI {model}: {e}")
         return None
@@ -201,6 +197,7 @@ MODEL_TO_API = {
 }
 
 
+@cached_response
 async def query_model_direct(
     model: str,
     messages: List[Dict[str, str]],
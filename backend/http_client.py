@@ -0,0 +1,106 @@
+"""Shared HTTP client for LLM API requests."""
+
+import asyncio
+import random
+import weakref
+from typing import Optional
+import httpx
+
+try:
+    import h2  # noqa: F401  (httpx's optional HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Connection pool of the shared client
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 20
+
+# Retries of a rate-limited (429) or temporarily failing (5xx, connection error)
+# request, with exponential backoff or the server's Retry-After
+MAX_RETRIES = 3
+MAX_RETRY_DELAY = 30.0
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# One client per event loop: httpx connections belong to the loop that opened them
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the shared HTTP client for the running event loop.
+
+    Reusing one client keeps connections (and their TLS sessions) open between
+    LLM requests instead of setting up a new connection for every call. Pass the
+    per-request timeout to the request method.
+
+    Returns:
+        httpx.AsyncClient (HTTP/2 when the h2 package is installed)
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+        _clients[loop] = client
+    return client
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response]) -> float:
+    """Seconds to wait before retry number attempt + 1."""
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        delay = float(retry_after)
+    except (TypeError, ValueError):
+        delay = 2 ** attempt
+    # Jitter so concurrent council requests don't retry in lockstep
+    return min(delay, MAX_RETRY_DELAY) + random.uniform(0, 0.5)
+
+
+async def post_with_retry(url: str, **kwargs) -> httpx.Response:
+    """
+    POST with the shared client, retrying rate limits and transient failures.
+
+    Timeouts are not retried (they already took the full request timeout).
+
+    Args:
+        url: Request URL
+        **kwargs: Passed to httpx.AsyncClient.post (headers, json, timeout, ...)
+
+    Returns:
+        The successful response
+
+    Raises:
+        httpx.HTTPStatusError: Non-retryable status, or retries exhausted
+        httpx.TransportError: Connection failure after retries, or a timeout
+    """
+    client = get_http_client()
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await client.post(url, **kwargs)
+        except httpx.TimeoutException:
+            raise
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+            await asyncio.sleep(_retry_delay(attempt, None))
+            continue
+        if response.status_code in RETRY_STATUS_CODES and attempt < MAX_RETRIES:
+            await asyncio.sleep(_retry_delay(attempt, response))
+            continue
+        response.raise_for_status()
+        return response
+
+
+async def close_http_client():
+    """Close the running event loop's shared client, if one was created."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
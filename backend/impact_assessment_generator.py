@@ -8,13 +8,13 @@ Generates high-quality, policy-grade impact assessments using:
 """
 
 import json
-from pathlib import Path
+import re
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 try:
-    from .vector_store import VectorStore
-    from .knowledge_graph import KnowledgeGraphBuilder
+    from .knowledge_graph import get_chunks_for_categories
+    from .retrieval_resources import FILTER_KEYS, get_vector_store, get_knowledge_graph, graph_chunk_results
     from .council import stage1_generate_opinions, stage2_collect_rankings, stage3_synthesize_final
     from .config import CHAIRMAN_MODEL
     IMPORTS_AVAILABLE = True
@@ -23,6 +23,12 @@ except ImportError as e:
     IMPORT_ERROR = str(e)
 
 
+if IMPORTS_AVAILABLE:
+    # Context key -> vector store metadata key used for retrieval filtering (the
+    # generator also filters on document type)
+    _FILTER_KEYS = FILTER_KEYS + (("document_type", "document_type"),)
+
+
 class ImpactAssessmentGenerator:
     """Generates EU-style impact assessments using RAG and LLM Council."""
     
@@ -54,24 +60,9 @@ class ImpactAssessmentGenerator:
         if not IMPORTS_AVAILABLE:
             raise RuntimeError(f"Required imports not available: {IMPORT_ERROR}")
         
-        # Load vector store
-        self.vector_store = VectorStore(use_local_model=True)
-        try:
-            self.vector_store.load(vector_store_path)
-            print(f"✅ Vector store loaded from: {vector_store_path}")
-        except FileNotFoundError:
-            print(f"⚠️  Vector store not found: {vector_store_path}")
-            self.vector_store = None
-        
-        # Load knowledge graph
-        self.knowledge_graph = None
-        if Path(knowledge_graph_path).exists():
-            builder = KnowledgeGraphBuilder()
-            try:
-                self.knowledge_graph = builder.load_graph(knowledge_graph_path)
-                print(f"✅ Knowledge graph loaded from: {knowledge_graph_path}")
-            except Exception as e:
-                print(f"⚠️  Could not load knowledge graph: {e}")
+        # Load (or reuse) the vector store and knowledge graph
+        self.vector_store = get_vector_store(vector_store_path)
+        self.knowledge_graph = get_knowledge_graph(knowledge_graph_path)
     
     def generate(
         self,
@@ -134,16 +125,9 @@ class ImpactAssessmentGenerator:
         }
         
         # Build metadata filters from context
-        filters = {}
+        filters = None
         if context:
-            if "jurisdiction" in context:
-                filters["jurisdiction"] = context["jurisdiction"]
-            if "category" in context:
-                filters["categories"] = context["category"]
-            if "year" in context:
-                filters["year"] = context["year"]
-            if "document_type" in context:
-                filters["document_type"] = context["document_type"]
+            filters = {dst: context[src] for src, dst in _FILTER_KEYS if src in context} or None
         
         # Vector store retrieval
         if self.vector_store:
@@ -155,7 +139,7 @@ class ImpactAssessmentGenerator:
                 results = self.vector_store.search(
                     query,
                     top_k=top_k,
-                    filter_metadata=filters if filters else None,
+                    filter_metadata=filters,
                     use_hybrid=(strategy == "hybrid"),
                     dense_weight=dense_weight,
                     sparse_weight=sparse_weight
@@ -167,7 +151,7 @@ class ImpactAssessmentGenerator:
                 results = self.vector_store.search(
                     query,
                     top_k=top_k,
-                    filter_metadata=filters if filters else None,
+                    filter_metadata=filters,
                     use_hybrid=False,
                     dense_weight=0.0,
                     sparse_weight=1.0
@@ -212,24 +196,10 @@ class ImpactAssessmentGenerator:
             if any(kw in query_lower for kw in keywords):
                 categories.append(category)
         
-        # Find chunks in matching categories
-        chunks = []
-        for category in categories[:3]:  # Limit to 3 categories
-            category_node = f"category:{category}"
-            if category_node in self.knowledge_graph:
-                # Get chunks connected to this category
-                for chunk_node in self.knowledge_graph.successors(category_node):
-                    if self.knowledge_graph.nodes[chunk_node].get("node_type") == "chunk":
-                        chunk_data = self.knowledge_graph.nodes[chunk_node]
-                        chunks.append({
-                            "chunk_id": chunk_data.get("chunk_id", ""),
-                            "content": chunk_data.get("content", ""),
-                            "metadata": chunk_data.get("metadata", {}),
-                            "score": 0.8,  # Graph-based relevance score
-                            "source": "knowledge_graph"
-                        })
-        
-        return chunks[:top_k]
+        # Find chunks in matching categories (one batched lookup, max 3 categories)
+        chunks_by_category = get_chunks_for_categories(self.knowledge_graph, categories[:3])
+        
+        return graph_chunk_results(chunks_by_category, top_k)
     
     def _deduplicate_chunks(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Remove duplicate chunks based on chunk_id."""
@@ -375,7 +345,6 @@ Please provide a structured impact assessment following EU Impact Assessment con
             section_num = section_name.split(".")[0]
             pattern = f"{section_num}\\.|{section_name}"
             
-            import re
             match = re.search(pattern, content, re.IGNORECASE)
             if match:
                 # Extract section content (until next section or end)
@@ -410,6 +379,21 @@ Please provide a structured impact assessment following EU Impact Assessment con
         return sources
 
 
+_generator: Optional[ImpactAssessmentGenerator] = None
+
+
+def _get_generator() -> ImpactAssessmentGenerator:
+    """Return the shared generator, loading the vector store and graph on first use."""
+    global _generator
+    if _generator is not None:
+        return _generator
+    generator = ImpactAssessmentGenerator()
+    # Only share a fully loaded generator so a missing store or graph is retried next call
+    if generator.vector_store is not None and generator.knowledge_graph is not None:
+        _generator = generator
+    return generator
+
+
 async def generate_impact_assessment(
     query: str,
     context: Optional[Dict[str, Any]] = None,
@@ -428,7 +412,7 @@ async def generate_impact_assessment(
     Returns:
         Generated impact assessment
     """
-    generator = ImpactAssessmentGenerator()
+    generator = _get_generator()
     assessment = await generator.generate(
         query=query,
         context=context,
@@ -5,13 +5,32 @@ Builds explicit relationships between concepts, domains, and analytical patterns
 Uses NetworkX for in-memory graph representation.
 """
 
+import gc
 import json
+import os
 import networkx as nx
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Set
-from datetime import datetime
+from typing import Dict, List, Any, Optional, Set, Tuple
 import pickle
 
+# Chunk nodes and edges are buffered and written to the graph in bulk, in
+# batches of at most this many operations
+GRAPH_WRITE_BATCH_SIZE = 1000
+
+# Threads reading and parsing chunk files ahead of the (single-threaded) graph writes
+CHUNK_FILE_READERS = 4
+# Chunk files read per round, which bounds how many parsed files wait in memory
+CHUNK_FILE_READ_AHEAD = 2 * CHUNK_FILE_READERS
+
+
+def _chunked(iterable, size: int):
+    """Yield lists of up to size items from iterable."""
+    iterator = iter(iterable)
+    return iter(lambda: list(islice(iterator, size)), [])
+
 
 class KnowledgeGraphBuilder:
     """Builds knowledge graph from chunks using NetworkX."""
@@ -56,6 +75,17 @@ class KnowledgeGraphBuilder:
         "Social Cohesion": ["social", "legal"]
     }
     
+    # Pattern mappings (pattern → domains it applies to)
+    PATTERN_TO_DOMAINS = {
+        "cost_benefit": ["economic"],
+        "risk_based": ["legal", "environmental"],
+        "market_failure": ["economic"],
+        "stakeholder_analysis": ["social", "legal"],
+        "impact_assessment": ["legal", "environmental", "social"],
+        "baseline_comparison": ["economic", "environmental"],
+        "subsidiarity_analysis": ["legal", "administrative"]
+    }
+    
     # Analysis pattern mappings (analysis_type → patterns)
     ANALYSIS_TYPE_TO_PATTERNS = {
         "problem_definition": ["risk_based", "market_failure"],
@@ -68,6 +98,12 @@ class KnowledgeGraphBuilder:
         "subsidiarity_proportionality": ["subsidiarity_analysis"]
     }
     
+    # Pattern node ids per analysis_type, built once instead of per chunk
+    ANALYSIS_TYPE_TO_PATTERN_NODES = {
+        analysis_type: tuple(f"pattern:{pattern}" for pattern in patterns)
+        for analysis_type, patterns in ANALYSIS_TYPE_TO_PATTERNS.items()
+    }
+    
     def __init__(self):
         """Initialize knowledge graph builder."""
         self.graph = nx.MultiDiGraph()  # MultiDiGraph for multiple relationship types
@@ -78,6 +114,17 @@ class KnowledgeGraphBuilder:
             "document": 0,
             "chunk": 0
         }
+        # Analysis chunk nodes per document node, in insertion order (dict as an
+        # ordered set), so evidence linking doesn't scan every chunk of the document
+        self._analysis_chunks_by_doc: Dict[str, Dict[str, None]] = {}
+        # Domain nodes linked to each category node, recorded when the links are
+        # created so chunk linking doesn't re-scan the category's neighbours
+        self._category_domains: Dict[str, List[str]] = {}
+        # Category name -> node id, filled when the category nodes are created
+        self._category_node_ids: Dict[str, str] = {}
+        # Chunk nodes and edges waiting to be added (see _flush_pending)
+        self._pending_nodes: List[tuple] = []
+        self._pending_edges: List[tuple] = []
     
     def build_from_chunks(self, chunks_dir: str = "chunks") -> nx.MultiDiGraph:
         """
@@ -109,9 +156,15 @@ class KnowledgeGraphBuilder:
         # Step 3: Create analysis pattern nodes
         self._create_analysis_pattern_nodes()
         
-        # Step 4: Process each chunk file
-        for chunk_file in chunk_files:
-            self._process_chunk_file(chunk_file)
+        # Step 4: Process each chunk file. Files are read and parsed in a thread
+        # pool; NetworkX graphs aren't thread-safe, so nodes and edges are still
+        # added here, one file at a time in file order
+        # (executor.map submits everything up front, so files go in rounds of
+        # CHUNK_FILE_READ_AHEAD rather than all being parsed into memory at once)
+        with ThreadPoolExecutor(max_workers=CHUNK_FILE_READERS) as executor:
+            for file_batch in _chunked(chunk_files, CHUNK_FILE_READ_AHEAD):
+                for chunks_data in executor.map(self._read_chunk_file, file_batch):
+                    self._process_chunk_data(chunks_data)
         
         print(f"✅ Knowledge graph built:")
         print(f"   Nodes: {self.graph.number_of_nodes()}")
@@ -124,119 +177,157 @@ class KnowledgeGraphBuilder:
         from backend.chunking_engine import PolicyCategoryMapper
         
         categories = PolicyCategoryMapper.POLICY_CATEGORIES
+        self._category_node_ids.update((category, f"category:{category}") for category in categories)
         
-        for category in categories:
-            node_id = f"category:{category}"
-            self.graph.add_node(
-                node_id,
-                node_type="category",
-                name=category,
-                label=category
-            )
-            self.node_counters["category"] += 1
+        # All category nodes in one bulk insert
+        self._add_new_nodes("category", (
+            (self._category_node_ids[category], {"node_type": "category", "name": category, "label": category})
+            for category in categories
+        ))
+    
+    def _add_new_nodes(self, node_type: str, nodes):
+        """
+        Bulk-add the (node_id, attrs) pairs that aren't in the graph yet.
+        
+        Structure nodes are create-only: rebuilding on an existing graph leaves
+        nodes that are already there untouched instead of rewriting their attributes.
+        """
+        new_nodes = [(node_id, attrs) for node_id, attrs in nodes if node_id not in self.graph]
+        self.graph.add_nodes_from(new_nodes)
+        self.node_counters[node_type] += len(new_nodes)
     
     def _create_domain_nodes(self):
         """Create domain nodes and link them to categories."""
-        # Create domain nodes
-        for domain_type in self.DOMAIN_TYPES:
-            node_id = f"domain:{domain_type}"
-            self.graph.add_node(
-                node_id,
-                node_type="domain",
-                domain_type=domain_type,
-                name=domain_type.capitalize(),
-                label=f"{domain_type.capitalize()} Domain"
+        # Create domain nodes (one bulk insert)
+        domain_nodes = {domain_type: f"domain:{domain_type}" for domain_type in self.DOMAIN_TYPES}
+        self._add_new_nodes("domain", (
+            (
+                domain_nodes[domain_type],
+                {
+                    "node_type": "domain",
+                    "domain_type": domain_type,
+                    "name": domain_type.capitalize(),
+                    "label": f"{domain_type.capitalize()} Domain"
+                }
             )
-            self.node_counters["domain"] += 1
+            for domain_type in self.DOMAIN_TYPES
+        ))
         
-        # Link categories to domains
+        # Link categories to domains: collect every missing edge, then add them in one call.
+        # Both ends are nodes created just above, so their ids come from the maps
+        # built there instead of being looked up in the graph again.
+        edges = []
         for category, domains in self.CATEGORY_TO_DOMAINS.items():
-            category_node = f"category:{category}"
-            if category_node in self.graph:
-                for domain_type in domains:
-                    domain_node = f"domain:{domain_type}"
-                    if domain_node in self.graph:
-                        self.graph.add_edge(
-                            category_node,
-                            domain_node,
-                            relationship_type="has_domain",
-                            weight=1.0
-                        )
+            category_node = self._category_node_ids.get(category)
+            if category_node is not None:
+                linked_domains = self._category_domains[category_node] = []
+                for domain_node in (domain_nodes.get(domain_type) for domain_type in domains):
+                    if domain_node is not None:
+                        linked_domains.append(domain_node)
+                        if self.graph.has_edge(category_node, domain_node):
+                            continue
+                        edges.append((category_node, domain_node, {"relationship_type": "has_domain", "weight": 1.0}))
                         # Bidirectional relationship
-                        self.graph.add_edge(
-                            domain_node,
-                            category_node,
-                            relationship_type="belongs_to_category",
-                            weight=1.0
-                        )
+                        edges.append((domain_node, category_node, {"relationship_type": "belongs_to_category", "weight": 1.0}))
+        self.graph.add_edges_from(edges)
     
     def _create_analysis_pattern_nodes(self):
         """Create analysis pattern nodes and link them to domains."""
-        # Create analysis pattern nodes
-        for pattern in self.ANALYSIS_PATTERNS:
-            node_id = f"pattern:{pattern}"
-            self.graph.add_node(
-                node_id,
-                node_type="analysis_pattern",
-                pattern_type=pattern,
-                name=pattern.replace("_", " ").title(),
-                label=f"{pattern.replace('_', ' ').title()} Pattern"
+        # Create analysis pattern nodes (one bulk insert)
+        pattern_nodes = {pattern: f"pattern:{pattern}" for pattern in self.ANALYSIS_PATTERNS}
+        self._add_new_nodes("analysis_pattern", (
+            (
+                pattern_nodes[pattern],
+                {
+                    "node_type": "analysis_pattern",
+                    "pattern_type": pattern,
+                    "name": pattern.replace("_", " ").title(),
+                    "label": f"{pattern.replace('_', ' ').title()} Pattern"
+                }
             )
-            self.node_counters["analysis_pattern"] += 1
+            for pattern in self.ANALYSIS_PATTERNS
+        ))
         
         # Link patterns to relevant domains
-        pattern_domain_mapping = {
-            "cost_benefit": ["economic"],
-            "risk_based": ["legal", "environmental"],
-            "market_failure": ["economic"],
-            "stakeholder_analysis": ["social", "legal"],
-            "impact_assessment": ["legal", "environmental", "social"],
-            "baseline_comparison": ["economic", "environmental"],
-            "subsidiarity_analysis": ["legal", "administrative"]
-        }
-        
-        for pattern, domains in pattern_domain_mapping.items():
-            pattern_node = f"pattern:{pattern}"
-            if pattern_node in self.graph:
+        # Flatten the missing links into one edge list per relationship type and add each in one call
+        uses_pattern_edges = []
+        applies_to_domain_edges = []
+        for pattern, domains in self.PATTERN_TO_DOMAINS.items():
+            pattern_node = pattern_nodes.get(pattern)
+            if pattern_node is not None:
                 for domain_type in domains:
                     domain_node = f"domain:{domain_type}"
-                    if domain_node in self.graph:
-                        self.graph.add_edge(
-                            domain_node,
-                            pattern_node,
-                            relationship_type="uses_pattern",
-                            weight=1.0
-                        )
-                        self.graph.add_edge(
-                            pattern_node,
-                            domain_node,
-                            relationship_type="applies_to_domain",
-                            weight=1.0
-                        )
-    
-    def _process_chunk_file(self, chunk_file: Path):
-        """Process a chunk file and add nodes/edges to graph."""
+                    if domain_type in self.DOMAIN_TYPES and not self.graph.has_edge(domain_node, pattern_node):
+                        uses_pattern_edges.append((domain_node, pattern_node))
+                        applies_to_domain_edges.append((pattern_node, domain_node))
+        self.graph.add_edges_from(uses_pattern_edges, relationship_type="uses_pattern", weight=1.0)
+        self.graph.add_edges_from(applies_to_domain_edges, relationship_type="applies_to_domain", weight=1.0)
+    
+    def _category_node_id(self, category: str) -> str:
+        """Node id for a category name (precomputed for the policy categories)."""
+        node_id = self._category_node_ids.get(category)
+        return node_id if node_id is not None else f"category:{category}"
+    
+    @staticmethod
+    def _read_chunk_file(chunk_file: Path) -> Dict[str, Any]:
+        """Read and parse a chunk file."""
         with open(chunk_file, 'r', encoding='utf-8') as f:
-            chunks_data = json.load(f)
-        
+            return json.load(f)
+    
+    def _process_chunk_data(self, chunks_data: Dict[str, Any]):
+        """Add the nodes/edges for one parsed chunk file to the graph."""
         source_doc = chunks_data.get("source_document", "")
         chunks = chunks_data.get("chunks", [])
         
         # Create document node
         doc_node_id = f"document:{source_doc}"
         if doc_node_id not in self.graph:
-            self.graph.add_node(
-                doc_node_id,
-                node_type="document",
-                name=source_doc,
-                label=source_doc,
-                chunk_count=len(chunks)
-            )
+            # Written with the file's first batch of chunk nodes and edges
+            self._queue_node(doc_node_id, {
+                "node_type": "document",
+                "name": source_doc,
+                "label": source_doc,
+                "chunk_count": len(chunks)
+            })
             self.node_counters["document"] += 1
         
         # Process each chunk
         for chunk in chunks:
             self._process_chunk(chunk, doc_node_id)
+        self._flush_pending()
+    
+    def _queue_node(self, node_id: str, attrs: Dict[str, Any]):
+        """Buffer a node for the next bulk write."""
+        self._pending_nodes.append((node_id, attrs))
+        if len(self._pending_nodes) + len(self._pending_edges) >= GRAPH_WRITE_BATCH_SIZE:
+            self._flush_pending()
+    
+    def _queue_edge(self, source: str, target: str, relationship_type: str, weight: float):
+        """Buffer an edge for the next bulk write."""
+        self._pending_edges.append((source, target, {"relationship_type": relationship_type, "weight": weight}))
+        if len(self._pending_nodes) + len(self._pending_edges) >= GRAPH_WRITE_BATCH_SIZE:
+            self._flush_pending()
+    
+    def _queue_edges(self, edges: List[Tuple[str, str, Dict[str, Any]]]):
+        """Buffer a whole group of edges at once, flushing when the batch fills."""
+        self._pending_edges.extend(edges)
+        if len(self._pending_nodes) + len(self._pending_edges) >= GRAPH_WRITE_BATCH_SIZE:
+            self._flush_pending()
+    
+    def _flush_pending(self):
+        """
+        Add the buffered nodes, then the buffered edges, to the graph.
+        
+        Buffered edges only reference nodes already in the graph or buffered
+        alongside them, so node order and each node's edge order are the same
+        as adding them one by one.
+        """
+        if self._pending_nodes:
+            self.graph.add_nodes_from(self._pending_nodes)
+            self._pending_nodes = []
+        if self._pending_edges:
+            self.graph.add_edges_from(self._pending_edges)
+            self._pending_edges = []
     
     def _process_chunk(self, chunk: Dict[str, Any], doc_node_id: str):
         """Process a single chunk and create nodes/edges."""
@@ -246,31 +337,22 @@ class KnowledgeGraphBuilder:
         
         # Create chunk node
         chunk_node_id = f"chunk:{chunk_id}"
-        self.graph.add_node(
-            chunk_node_id,
-            node_type="chunk",
-            chunk_type=chunk_type,
-            chunk_id=chunk_id,
-            name=chunk_id,
-            label=f"{chunk_type.capitalize()} Chunk",
-            content=chunk.get("content", "")[:500],  # Store first 500 chars
-            metadata=metadata
-        )
+        self._queue_node(chunk_node_id, {
+            "node_type": "chunk",
+            "chunk_type": chunk_type,
+            "chunk_id": chunk_id,
+            "name": chunk_id,
+            "label": f"{chunk_type.capitalize()} Chunk",
+            "content": chunk.get("content", "")[:500],  # Store first 500 chars
+            "metadata": metadata
+        })
         self.node_counters["chunk"] += 1
         
         # Link chunk to document
-        self.graph.add_edge(
-            doc_node_id,
-            chunk_node_id,
-            relationship_type="contains_chunk",
-            weight=1.0
-        )
-        self.graph.add_edge(
-            chunk_node_id,
-            doc_node_id,
-            relationship_type="belongs_to_document",
-            weight=1.0
-        )
+        self._queue_edge(doc_node_id, chunk_node_id, "contains_chunk", 1.0)
+        self._queue_edge(chunk_node_id, doc_node_id, "belongs_to_document", 1.0)
+        if chunk_type == "analysis":
+            self._analysis_chunks_by_doc.setdefault(doc_node_id, {})[chunk_node_id] = None
         
         # Process based on chunk type
         if chunk_type == "category":
@@ -284,20 +366,10 @@ class KnowledgeGraphBuilder:
         """Link category chunk to category node."""
         category = metadata.get("category")
         if category:
-            category_node = f"category:{category}"
+            category_node = self._category_node_id(category)
             if category_node in self.graph:
-                self.graph.add_edge(
-                    chunk_node_id,
-                    category_node,
-                    relationship_type="references_category",
-                    weight=1.0
-                )
-                self.graph.add_edge(
-                    category_node,
-                    chunk_node_id,
-                    relationship_type="has_chunk",
-                    weight=1.0
-                )
+                self._queue_edge(chunk_node_id, category_node, "references_category", 1.0)
+                self._queue_edge(category_node, chunk_node_id, "has_chunk", 1.0)
     
     def _link_analysis_chunk(self, chunk_node_id: str, metadata: Dict[str, Any], chunk: Dict[str, Any]):
         """Link analysis chunk to categories, domains, and patterns."""
@@ -306,55 +378,27 @@ class KnowledgeGraphBuilder:
         if not categories and metadata.get("category"):
             categories = [metadata["category"]]
         
-        for category in categories:
-            category_node = f"category:{category}"
-            if category_node in self.graph:
-                self.graph.add_edge(
-                    chunk_node_id,
-                    category_node,
-                    relationship_type="analyzes_category",
-                    weight=1.0
-                )
-                self.graph.add_edge(
-                    category_node,
-                    chunk_node_id,
-                    relationship_type="has_analysis",
-                    weight=1.0
-                )
+        # Category nodes are looked up once and reused for the domain links
+        category_nodes = [
+            category_node for category_node in map(self._category_node_id, categories)
+            if category_node in self.graph
+        ]
+        for category_node in category_nodes:
+            self._queue_edge(chunk_node_id, category_node, "analyzes_category", 1.0)
+            self._queue_edge(category_node, chunk_node_id, "has_analysis", 1.0)
         
         # Link to domains (via categories)
-        for category in categories:
-            category_node = f"category:{category}"
-            if category_node in self.graph:
-                # Find domains connected to this category
-                for domain_node in self.graph.successors(category_node):
-                    if self.graph.nodes[domain_node].get("node_type") == "domain":
-                        self.graph.add_edge(
-                            chunk_node_id,
-                            domain_node,
-                            relationship_type="analyzes_domain",
-                            weight=0.5
-                        )
+        for category_node in category_nodes:
+            for domain_node in self._category_domains.get(category_node, ()):
+                self._queue_edge(chunk_node_id, domain_node, "analyzes_domain", 0.5)
         
         # Link to analysis patterns
         analysis_type = metadata.get("analysis_type", "")
-        patterns = self.ANALYSIS_TYPE_TO_PATTERNS.get(analysis_type, [])
         
-        for pattern in patterns:
-            pattern_node = f"pattern:{pattern}"
+        for pattern_node in self.ANALYSIS_TYPE_TO_PATTERN_NODES.get(analysis_type, ()):
             if pattern_node in self.graph:
-                self.graph.add_edge(
-                    chunk_node_id,
-                    pattern_node,
-                    relationship_type="uses_pattern",
-                    weight=1.0
-                )
-                self.graph.add_edge(
-                    pattern_node,
-                    chunk_node_id,
-                    relationship_type="instantiated_by",
-                    weight=1.0
-                )
+                self._queue_edge(chunk_node_id, pattern_node, "uses_pattern", 1.0)
+                self._queue_edge(pattern_node, chunk_node_id, "instantiated_by", 1.0)
     
     def _link_evidence_chunk(self, chunk_node_id: str, metadata: Dict[str, Any], chunk: Dict[str, Any]):
         """Link evidence chunk to analysis chunks and categories."""
@@ -364,24 +408,19 @@ class KnowledgeGraphBuilder:
         # Find related analysis chunks in same document
         source_doc = chunk.get("source_document", "")
         if source_doc:
-            # Get all chunks from same document
+            # Analysis chunks of the same document, from the index
             doc_node = f"document:{source_doc}"
-            if doc_node in self.graph:
-                for chunk_node in self.graph.successors(doc_node):
-                    if self.graph.nodes[chunk_node].get("chunk_type") == "analysis":
-                        # Link evidence to analysis
-                        self.graph.add_edge(
-                            chunk_node_id,
-                            chunk_node,
-                            relationship_type="supports_analysis",
-                            weight=1.0
-                        )
-                        self.graph.add_edge(
-                            chunk_node,
-                            chunk_node_id,
-                            relationship_type="supported_by_evidence",
-                            weight=1.0
-                        )
+            analysis_nodes = self._analysis_chunks_by_doc.get(doc_node, ())
+            if analysis_nodes:
+                # Link evidence to analysis; queued as one group rather than
+                # edge by edge, since this fan-out dominates the edge count
+                supports = {"relationship_type": "supports_analysis", "weight": 1.0}
+                supported_by = {"relationship_type": "supported_by_evidence", "weight": 1.0}
+                edges = []
+                for chunk_node in analysis_nodes:
+                    edges.append((chunk_node_id, chunk_node, supports.copy()))
+                    edges.append((chunk_node, chunk_node_id, supported_by.copy()))
+                self._queue_edges(edges)
         
         # Link to categories if present
         categories = metadata.get("categories", [])
@@ -389,20 +428,23 @@ class KnowledgeGraphBuilder:
             categories = [metadata["category"]]
         
         for category in categories:
-            category_node = f"category:{category}"
+            category_node = self._category_node_id(category)
             if category_node in self.graph:
-                self.graph.add_edge(
-                    chunk_node_id,
-                    category_node,
-                    relationship_type="evidence_for_category",
-                    weight=0.5
-                )
+                self._queue_edge(chunk_node_id, category_node, "evidence_for_category", 0.5)
     
     def save_graph(self, output_path: str = "knowledge_graph.pkl"):
-        """Save graph to pickle file."""
+        """
+        Save graph to pickle file.
+        
+        The pickle is written to a temp file and swapped in, so a process loading
+        the graph while it is being rebuilt sees either the old or the new file,
+        never a partly written one.
+        """
         output_file = Path(output_path)
-        with open(output_file, 'wb') as f:
-            pickle.dump(self.graph, f)
+        tmp_file = output_file.with_name(output_file.name + ".tmp")
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(self.graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, output_file)
         print(f"💾 Graph saved to: {output_path}")
     
     def load_graph(self, input_path: str = "knowledge_graph.pkl") -> nx.MultiDiGraph:
@@ -411,28 +453,49 @@ class KnowledgeGraphBuilder:
         if not input_file.exists():
             raise FileNotFoundError(f"Graph file not found: {input_path}")
         
-        with open(input_file, 'rb') as f:
-            self.graph = pickle.load(f)
+        # Unpickling allocates one container per node/edge attribute dict, which
+        # keeps triggering the cyclic GC over objects that are all still live;
+        # pausing it makes large graphs load several times faster
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(input_file, 'rb') as f:
+                self.graph = pickle.load(f)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._index_analysis_chunks()
         
         print(f"📂 Graph loaded from: {input_path}")
         return self.graph
     
+    def _index_analysis_chunks(self):
+        """Rebuild the per-document analysis chunk index from the current graph."""
+        nodes = self.graph.nodes
+        self._analysis_chunks_by_doc = {}
+        for node, node_type in self.graph.nodes(data="node_type"):
+            if node_type == "document":
+                analysis_chunks = {
+                    chunk_node: None for chunk_node in self.graph.successors(node)
+                    if nodes[chunk_node].get("chunk_type") == "analysis"
+                }
+                if analysis_chunks:
+                    self._analysis_chunks_by_doc[node] = analysis_chunks
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get graph statistics."""
-        node_types = {}
-        edge_types = {}
-        
-        for node, data in self.graph.nodes(data=True):
-            node_type = data.get("node_type", "unknown")
-            node_types[node_type] = node_types.get(node_type, 0) + 1
-        
-        for u, v, data in self.graph.edges(data=True):
-            edge_type = data.get("relationship_type", "unknown")
-            edge_types[edge_type] = edge_types.get(edge_type, 0) + 1
+        # One pass over nodes and one over edges; the edge total comes from the
+        # per-type counts instead of another walk over the adjacency
+        node_types = dict(Counter(
+            node_type for _, node_type in self.graph.nodes(data="node_type", default="unknown")
+        ))
+        edge_types = dict(Counter(
+            edge_type for _, _, edge_type in self.graph.edges(data="relationship_type", default="unknown")
+        ))
         
         return {
-            "total_nodes": self.graph.number_of_nodes(),
-            "total_edges": self.graph.number_of_edges(),
+            "total_nodes": len(self.graph),
+            "total_edges": sum(edge_types.values()),
             "node_types": node_types,
             "edge_types": edge_types,
             "is_connected": nx.is_weakly_connected(self.graph) if self.graph.number_of_nodes() > 0 else False
@@ -488,6 +551,33 @@ class KnowledgeGraphBuilder:
         return chunk_ids
 
 
+def get_chunks_for_categories(
+    graph: nx.MultiDiGraph,
+    categories: List[str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Collect chunk nodes for several categories in a single pass.
+    
+    Args:
+        graph: Knowledge graph to read from
+        categories: Category names (without the "category:" prefix)
+    
+    Returns:
+        Dict mapping each category found in the graph to its chunk node data
+    """
+    nodes = graph.nodes
+    chunks_by_category = {}
+    for category in categories:
+        category_node = f"category:{category}"
+        if category_node not in graph:
+            continue
+        chunks_by_category[category] = [
+            data for data in (nodes[n] for n in graph.successors(category_node))
+            if data.get("node_type") == "chunk"
+        ]
+    return chunks_by_category
+
+
 def build_knowledge_graph(chunks_dir: str = "chunks", output_file: str = "knowledge_graph.pkl") -> nx.MultiDiGraph:
     """
     Build knowledge graph from chunks.
@@ -505,17 +595,18 @@ def build_knowledge_graph(chunks_dir: str = "chunks", output_file: str = "knowle
     # Save graph
     builder.save_graph(output_file)
     
-    # Print statistics
+    # Print statistics (assembled first and written with a single print)
     stats = builder.get_statistics()
-    print("\n📊 Graph Statistics:")
-    print(f"   Total nodes: {stats['total_nodes']}")
-    print(f"   Total edges: {stats['total_edges']}")
-    print(f"\n   Node types:")
-    for node_type, count in sorted(stats['node_types'].items()):
-        print(f"     - {node_type}: {count}")
-    print(f"\n   Edge types:")
-    for edge_type, count in sorted(stats['edge_types'].items()):
-        print(f"     - {edge_type}: {count}")
+    lines = [
+        "\n📊 Graph Statistics:",
+        f"   Total nodes: {stats['total_nodes']}",
+        f"   Total edges: {stats['total_edges']}",
+        f"\n   Node types:",
+    ]
+    lines.extend(f"     - {node_type}: {count}" for node_type, count in sorted(stats['node_types'].items()))
+    lines.append(f"\n   Edge types:")
+    lines.extend(f"     - {edge_type}: {count}" for edge_type, count in sorted(stats['edge_types'].items()))
+    print("\n".join(lines))
     
     return graph
 
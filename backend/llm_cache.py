@@ -0,0 +1,82 @@
+"""Persistent cache of LLM responses, for repeated development runs."""
+
+import asyncio
+import functools
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .config import LLM_CACHE_PATH
+
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+
+def _connection() -> sqlite3.Connection:
+    """Open (or return the already-open) cache database."""
+    global _conn
+    if _conn is None:
+        # Shared by every event loop/thread; access is serialized by _lock
+        _conn = sqlite3.connect(LLM_CACHE_PATH, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+        )
+    return _conn
+
+
+def cache_key(model: str, messages: List[Dict[str, str]]) -> str:
+    """Cache key for a request: SHA-256 of the model and the exact messages."""
+    payload = json.dumps(messages, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(f"{model}\0{payload}".encode("utf-8")).hexdigest()
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached response for a key, if any."""
+    with _lock:
+        row = _connection().execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def put(key: str, response: Dict[str, Any]):
+    """Store a response."""
+    with _lock:
+        conn = _connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)",
+            (key, json.dumps(response, ensure_ascii=False))
+        )
+        conn.commit()
+
+
+def cached_response(
+    query: Callable[..., Awaitable[Optional[Dict[str, Any]]]]
+) -> Callable[..., Awaitable[Optional[Dict[str, Any]]]]:
+    """
+    Serve repeated (model, messages) requests from the cache when LLM_CACHE_PATH is set.
+
+    Only successful responses are stored. Sampling settings are fixed per provider,
+    so the model and messages identify a request. Cache reads and writes run in a
+    worker thread, so concurrent requests aren't blocked on SQLite.
+
+    Args:
+        query: async query function taking (model, messages, timeout)
+
+    Returns:
+        Wrapped query function
+    """
+    @functools.wraps(query)
+    async def wrapper(model: str, messages: List[Dict[str, str]], timeout: float = 120.0):
+        if not LLM_CACHE_PATH:
+            return await query(model, messages, timeout)
+
+        key = cache_key(model, messages)
+        response = await asyncio.to_thread(get, key)
+        if response is None:
+            response = await query(model, messages, timeout)
+            if response is not None:
+                await asyncio.to_thread(put, key, response)
+        return response
+
+    return wrapper
@@ -1,18 +1,28 @@
 """FastAPI backend for LLM Council."""
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import uuid
 import json
 import asyncio
 
 from . import storage
+from .http_client import close_http_client
 from .council import run_full_council, generate_conversation_title, stage1_collect_responses, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings
 
-app = FastAPI(title="LLM Council API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close the shared LLM API HTTP client on shutdown."""
+    yield
+    await close_http_client()
+
+
+app = FastAPI(title="LLM Council API", lifespan=lifespan)
 
 # Enable CORS for local development
 app.add_middleware(
@@ -57,9 +67,9 @@ async def root():
 
 
 @app.get("/api/conversations", response_model=List[ConversationMetadata])
-async def list_conversations():
-    """List all conversations (metadata only)."""
-    return storage.list_conversations()
+async def list_conversations(limit: Optional[int] = None):
+    """List all conversations (metadata only), optionally only the newest `limit`."""
+    return storage.list_conversations(limit=limit)
 
 
 @app.post("/api/conversations", response_model=Conversation)
@@ -93,8 +103,8 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
     # Check if this is the first message
     is_first_message = len(conversation["messages"]) == 0
 
-    # Add user message
-    storage.add_user_message(conversation_id, request.content)
+    # Add user message (reusing the conversation loaded above)
+    storage.add_user_message(conversation_id, request.content, preloaded=conversation)
 
     # If this is the first message, generate a title
     if is_first_message:
@@ -139,8 +149,8 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
 
     async def event_generator():
         try:
-            # Add user message
-            storage.add_user_message(conversation_id, request.content)
+            # Add user message (reusing the conversation loaded above)
+            storage.add_user_message(conversation_id, request.content, preloaded=conversation)
 
             # Start title generation in parallel (don't await yet)
             title_task = None
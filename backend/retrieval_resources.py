@@ -0,0 +1,86 @@
+"""
+Retrieval resources shared by the RIA workflow and the impact assessment generator.
+
+The vector store and knowledge graph are loaded once per path per process, so
+every workflow or generator instance (in either module) reuses the same copy.
+"""
+
+import os
+import threading
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .vector_store import VectorStore
+from .knowledge_graph import KnowledgeGraphBuilder
+
+# Context key -> vector store metadata key used for retrieval filtering
+FILTER_KEYS: Tuple[Tuple[str, str], ...] = (
+    ("jurisdiction", "jurisdiction"),
+    ("category", "categories"),
+    ("year", "year"),
+)
+
+# Query embeddings are cached on disk by (model, text) hash, so re-running the
+# same proposal skips the embedding call (same cache file the store builds use)
+EMBEDDING_CACHE = os.getenv("EMBEDDING_CACHE", "embedding_cache.db")
+
+# Loaded once per path. Each resource has its own lock so callers block only
+# until that particular load has finished.
+_vector_stores: Dict[str, VectorStore] = {}
+_vector_store_lock = threading.Lock()
+_knowledge_graphs: Dict[str, Any] = {}
+_knowledge_graph_lock = threading.Lock()
+
+
+def get_vector_store(vector_store_path: str = "vector_store") -> Optional[VectorStore]:
+    """Load (or return the already-loaded) vector store for a path."""
+    with _vector_store_lock:
+        if vector_store_path not in _vector_stores and Path(vector_store_path).exists():
+            try:
+                store = VectorStore(use_local_model=True, embedding_cache_path=EMBEDDING_CACHE)
+                store.load(vector_store_path)
+                _vector_stores[vector_store_path] = store
+                print(f"✅ Vector store loaded from: {vector_store_path}")
+            except Exception as e:
+                print(f"⚠️  Could not load vector store: {e}")
+        return _vector_stores.get(vector_store_path)
+
+
+def get_knowledge_graph(knowledge_graph_path: str = "knowledge_graph.pkl"):
+    """Load (or return the already-loaded) knowledge graph for a path."""
+    with _knowledge_graph_lock:
+        if knowledge_graph_path not in _knowledge_graphs and Path(knowledge_graph_path).exists():
+            try:
+                builder = KnowledgeGraphBuilder()
+                _knowledge_graphs[knowledge_graph_path] = builder.load_graph(knowledge_graph_path)
+                print(f"✅ Knowledge graph loaded from: {knowledge_graph_path}")
+            except Exception as e:
+                print(f"⚠️  Could not load knowledge graph: {e}")
+        return _knowledge_graphs.get(knowledge_graph_path)
+
+
+def graph_chunk_results(
+    chunks_by_category: Dict[str, Iterable[Dict[str, Any]]],
+    top_k: int
+) -> List[Dict[str, Any]]:
+    """
+    Build retrieval results from a get_chunks_for_categories lookup.
+
+    Args:
+        chunks_by_category: Category -> chunk data, as returned by get_chunks_for_categories
+        top_k: Maximum number of results
+
+    Returns:
+        Up to top_k result dicts, categories in order (built lazily, stopping at top_k)
+    """
+    return [
+        {
+            "chunk_id": chunk_data.get("chunk_id", ""),
+            "content": chunk_data.get("content", ""),
+            "metadata": chunk_data.get("metadata", {}),
+            "score": 0.8,  # Graph-based relevance score
+            "source": "knowledge_graph"
+        }
+        for chunk_data in islice(chain.from_iterable(chunks_by_category.values()), top_k)
+    ]
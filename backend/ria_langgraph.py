@@ -9,13 +9,19 @@ This module implements a fully orchestrated workflow that:
 """
 
 import asyncio
-from typing import TypedDict, Annotated, Literal, Optional, List, Dict, Any
+import logging
+import os
+import threading
+import time
+from typing import TypedDict, Annotated, Literal, Optional, List, Dict, Any, Mapping, Tuple, AsyncIterator
 from typing_extensions import NotRequired
 import operator
+from collections import OrderedDict
 from datetime import datetime
+from itertools import islice
 import json
 import re
-from pathlib import Path
+from types import MappingProxyType
 
 try:
     from langgraph.graph import StateGraph, END
@@ -26,8 +32,14 @@ except ImportError:
     LANGGRAPH_AVAILABLE = False
     print("⚠️  LangGraph not installed. Install with: pip install langgraph")
 
-from .vector_store import VectorStore
-from .knowledge_graph import KnowledgeGraphBuilder
+try:
+    from openai import OpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+from .knowledge_graph import get_chunks_for_categories
+from .retrieval_resources import FILTER_KEYS, get_vector_store, get_knowledge_graph, graph_chunk_results
 from .council import (
     stage1_collect_responses,
     stage2_collect_rankings,
@@ -35,6 +47,8 @@ from .council import (
 )
 from .config import CHAIRMAN_MODEL
 
+logger = logging.getLogger(__name__)
+
 
 # ============================================================================
 # State Schema
@@ -82,6 +96,102 @@ class RIAState(TypedDict):
     human_review_result: NotRequired[str]  # "approved", "rejected", "revision"
 
 
+# Shared read-only stand-in for missing state dicts, so lookups like
+# state.get("stage3_result") don't allocate a fresh {} on every call
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# EU IA impact themes [1]..[21]. A theme counts as mentioned by "[n]", "Theme n",
+# "Impact Theme n" or "#n"; the unbracketed markers also match as a prefix
+# (e.g. "Theme 12" mentions themes 1 and 12). Every marker starts with a literal
+# token and a non-zero digit, so non-matching positions are rejected immediately.
+_ALL_THEME_NUMBERS: Tuple[int, ...] = tuple(range(1, 22))
+_ALL_THEMES: frozenset = frozenset(_ALL_THEME_NUMBERS)
+# Captured marker digits -> theme numbers they mention, so matches need no int conversion
+_THEMES_BY_BRACKETED: Dict[str, Tuple[int, ...]] = {str(n): (n,) for n in _ALL_THEME_NUMBERS}
+_THEMES_BY_PREFIXED: Dict[str, Tuple[int, ...]] = {
+    str(d): tuple(n for n in {d // 10 or d, d} if n <= 21) for d in range(1, 100)
+}
+
+# Citation references counted by validate_council_output (SWD, COM, Belgian RIA),
+# each with a lowercase literal that must occur for the regex to match at all
+_CITATION_RES = tuple((literal, re.compile(p, re.IGNORECASE)) for literal, p in (
+    ("swd(", r"SWD\([0-9]{4}\)"),
+    ("com(", r"COM\([0-9]{4}\)"),
+    ("belgian ria", r"Belgian RIA"),
+    ("ria ", r"RIA [0-9]{4}"),
+    ("swd(", r"SWD\([0-9]{4}\) [0-9]+"),
+))
+
+# Section headers used by extract_ria_sections: start patterns (tried in order) and the
+# pattern that ends each section
+_BACKGROUND_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"1\.\s*Background\s+and\s+Problem\s+Definition",
+    r"Background\s+and\s+Problem\s+Definition",
+    r"1\.\s*Background",
+    r"Background",
+    r"Problem\s+Definition",
+))
+_BACKGROUND_END_RE = re.compile(
+    r"2\.\s*(Executive\s+Summary|Proposal\s+Overview|Impact\s+Themes)|Executive\s+Summary|Proposal\s+Overview",
+    re.IGNORECASE
+)
+_EXEC_SUMMARY_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"2\.\s*Executive\s+Summary",
+    r"Executive\s+Summary",
+))
+_EXEC_SUMMARY_END_RE = re.compile(
+    r"3\.\s*(Proposal\s+Overview|Impact\s+Themes)|Proposal\s+Overview|21\s+Impact\s+Themes",
+    re.IGNORECASE
+)
+_PROPOSAL_OVERVIEW_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"3\.\s*Proposal\s+Overview",
+    r"Proposal\s+Overview",
+))
+_PROPOSAL_OVERVIEW_END_RE = re.compile(r"4\.\s*21\s+Impact\s+Themes|21\s+Impact\s+Themes", re.IGNORECASE)
+
+# Recent validate_council_output results keyed by the content itself (LRU)
+_VALIDATION_CACHE_SIZE = 128
+_validation_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_validation_cache_lock = threading.Lock()
+
+# Structure sections validate_council_output expects (case-insensitive)
+_REQUIRED_SECTIONS = (
+    "Executive Summary", "Proposal Overview", "Impact Themes", "Assessment Summary", "Recommendations"
+)
+
+# One scan of the council output for both theme markers (groups 1 and 2) and
+# required section names (group "section"). The two never overlap, so a single
+# finditer sees every match the separate scans would.
+_VALIDATION_SCAN_RE = re.compile(
+    r"\[([1-9][0-9]?)\]|(?:Theme |#)([1-9][0-9]?)"
+    r"|(?P<section>(?i:" + "|".join(_REQUIRED_SECTIONS) + "))"
+)
+
+
+# ============================================================================
+# Shared Resources
+# ============================================================================
+
+async def prefetch_resources(
+    vector_store_path: str = "vector_store",
+    knowledge_graph_path: str = "knowledge_graph.pkl"
+):
+    """
+    Load the vector store and knowledge graph concurrently, off the event loop.
+
+    Start this as a task while doing other setup; the workflow then finds both
+    resources already loaded (or waits on the loader locks for the remainder).
+
+    Args:
+        vector_store_path: Path to vector store directory
+        knowledge_graph_path: Path to knowledge graph pickle file
+    """
+    await asyncio.gather(
+        asyncio.to_thread(get_vector_store, vector_store_path),
+        asyncio.to_thread(get_knowledge_graph, knowledge_graph_path)
+    )
+
+
 # ============================================================================
 # Node Implementations
 # ============================================================================
@@ -214,25 +324,9 @@ class RIAWorkflow:
         if not LANGGRAPH_AVAILABLE:
             raise RuntimeError("LangGraph is not installed. Install with: pip install langgraph")
         
-        # Load vector store
-        self.vector_store = None
-        if Path(vector_store_path).exists():
-            try:
-                self.vector_store = VectorStore(use_local_model=True)
-                self.vector_store.load(vector_store_path)
-                print(f"✅ Vector store loaded from: {vector_store_path}")
-            except Exception as e:
-                print(f"⚠️  Could not load vector store: {e}")
-        
-        # Load knowledge graph
-        self.knowledge_graph = None
-        if Path(knowledge_graph_path).exists():
-            try:
-                builder = KnowledgeGraphBuilder()
-                self.knowledge_graph = builder.load_graph(knowledge_graph_path)
-                print(f"✅ Knowledge graph loaded from: {knowledge_graph_path}")
-            except Exception as e:
-                print(f"⚠️  Could not load knowledge graph: {e}")
+        # Load vector store and knowledge graph (shared across instances)
+        self.vector_store = get_vector_store(vector_store_path)
+        self.knowledge_graph = get_knowledge_graph(knowledge_graph_path)
         
         # Build graph
         self.graph = self._build_graph()
@@ -247,6 +341,7 @@ class RIAWorkflow:
         workflow.add_node("route_retrieval", self.route_retrieval_strategy)
         workflow.add_node("retrieve_vector", self.retrieve_from_vector_store)
         workflow.add_node("retrieve_graph", self.retrieve_from_knowledge_graph)
+        workflow.add_node("retrieve_hybrid", self.retrieve_hybrid)
         workflow.add_node("merge_results", self.merge_retrieval_results)
         workflow.add_node("check_retrieval_quality", self.check_retrieval_quality)
         workflow.add_node("expand_retrieval", self.expand_retrieval)
@@ -282,7 +377,7 @@ class RIAWorkflow:
             {
                 "vector_only": "retrieve_vector",
                 "graph_only": "retrieve_graph",
-                "hybrid": "retrieve_vector",  # Start with vector, then graph
+                "hybrid": "retrieve_hybrid",  # Vector and graph concurrently
                 "graph_first": "retrieve_graph"
             }
         )
@@ -299,6 +394,7 @@ class RIAWorkflow:
         
         # After graph retrieval, go to merge
         workflow.add_edge("retrieve_graph", "merge_results")
+        workflow.add_edge("retrieve_hybrid", "merge_results")
         
         # After merge, check quality
         workflow.add_edge("merge_results", "check_retrieval_quality")
@@ -373,17 +469,13 @@ class RIAWorkflow:
         if not proposal:
             return self._add_error(state, "No proposal provided")
         
-        # Initialize state
-        new_state = {
-            **state,
-            "context": state.get("context", {}),
-            "errors": [],
-            "retry_count": 0,
-            "quality_metrics": {}
-        }
-        
-        print(f"✅ Proposal ingested: {proposal[:100]}...")
-        return new_state
+        # Initialize state in place (no need to copy every key of the input state)
+        state.setdefault("context", {})
+        state.update(errors=[], retry_count=0, quality_metrics={})
+
+        print(f"✅ Proposal ingested ({len(proposal)} chars)")
+        logger.debug("Proposal preview: %.100s", proposal)
+        return state
     
     def extract_features(self, state: RIAState) -> RIAState:
         """Extract features from proposal for routing decisions."""
@@ -420,7 +512,7 @@ class RIAWorkflow:
         """Determine retrieval strategy based on features."""
         print(f"\n🧭 Routing retrieval strategy...")
         
-        features = state.get("features", {})
+        features = state.get("features") or _EMPTY
         context = state.get("context", {})
         
         # Strategy decision logic
@@ -482,13 +574,7 @@ class RIAWorkflow:
         filters = None  # Don't filter by default to get more results
         # Only filter if explicitly requested
         if context and context.get("strict_filtering", False):
-            filters = {}
-            if "jurisdiction" in context:
-                filters["jurisdiction"] = context["jurisdiction"]
-            if "category" in context:
-                filters["categories"] = context["category"]
-            if "year" in context:
-                filters["year"] = context["year"]
+            filters = {dst: context[src] for src, dst in FILTER_KEYS if src in context} or None
         
         try:
             # Determine search parameters based on strategy
@@ -508,7 +594,7 @@ class RIAWorkflow:
                 results = self.vector_store.search(
                     proposal,
                     top_k=top_k,
-                    filter_metadata=filters if filters else None,
+                    filter_metadata=filters,
                     use_hybrid=False,
                     dense_weight=0.0,
                     sparse_weight=1.0
@@ -531,7 +617,7 @@ class RIAWorkflow:
             return self._add_error(state, "Knowledge graph not available")
         
         proposal = state.get("proposal", "").lower()
-        features = state.get("features", {})
+        features = state.get("features") or _EMPTY
         top_k = 10
         
         try:
@@ -543,33 +629,41 @@ class RIAWorkflow:
                     if any(kw in proposal for kw in keywords):
                         categories.append(category)
             
-            # Find chunks in matching categories
-            chunks = []
-            for category in categories[:3]:  # Limit to 3 categories
-                category_node = f"category:{category}"
-                if category_node in self.knowledge_graph:
-                    # Get chunks connected to this category
-                    for chunk_node in self.knowledge_graph.successors(category_node):
-                        if self.knowledge_graph.nodes[chunk_node].get("node_type") == "chunk":
-                            chunk_data = self.knowledge_graph.nodes[chunk_node]
-                            chunks.append({
-                                "chunk_id": chunk_data.get("chunk_id", ""),
-                                "content": chunk_data.get("content", ""),
-                                "metadata": chunk_data.get("metadata", {}),
-                                "score": 0.8,  # Graph-based relevance score
-                                "source": "knowledge_graph"
-                            })
+            # Find chunks in matching categories (one batched lookup, max 3 categories)
+            started = time.perf_counter()
+            chunks_by_category = get_chunks_for_categories(self.knowledge_graph, categories[:3])
             
-            # Limit results
-            chunks = chunks[:top_k]
+            chunks = graph_chunk_results(chunks_by_category, top_k)
+            elapsed_ms = (time.perf_counter() - started) * 1000
             
-            print(f"✅ Retrieved {len(chunks)} chunks from knowledge graph")
+            print(f"✅ Retrieved {len(chunks)} chunks from knowledge graph ({elapsed_ms:.1f} ms)")
             
             return {**state, "graph_results": chunks}
         
         except Exception as e:
             return self._add_error(state, f"Knowledge graph retrieval error: {str(e)}")
     
+    async def retrieve_hybrid(self, state: RIAState) -> RIAState:
+        """Retrieve from vector store and knowledge graph concurrently."""
+        # Both retrievers are blocking (embedding model, numpy, graph lookups), so
+        # each runs in a worker thread on its own snapshot of the state; only the
+        # results and any new errors are merged back
+        errors = state.get("errors", [])
+        vector_state, graph_state = await asyncio.gather(
+            asyncio.to_thread(self.retrieve_from_vector_store, {**state, "errors": list(errors)}),
+            asyncio.to_thread(self.retrieve_from_knowledge_graph, {**state, "errors": list(errors)}),
+        )
+        new_errors = vector_state["errors"][len(errors):] + graph_state["errors"][len(errors):]
+        
+        merged = {**state}
+        if "vector_results" in vector_state:
+            merged["vector_results"] = vector_state["vector_results"]
+        if "graph_results" in graph_state:
+            merged["graph_results"] = graph_state["graph_results"]
+        if new_errors:
+            merged["errors"] = errors + new_errors
+        return merged
+    
     def merge_retrieval_results(self, state: RIAState) -> RIAState:
         """Merge and deduplicate retrieval results."""
         print(f"\n🔀 Merging retrieval results...")
@@ -609,6 +703,8 @@ class RIAWorkflow:
         
         # Quality metrics
         chunk_count = len(chunks)
+        # merged_chunks is capped at 20: a plain sum (~1 µs) beats building a numpy
+        # array for the mean, and keeps avg_score a plain float in the state
         avg_score = sum(c.get("score", 0) for c in chunks) / chunk_count if chunk_count > 0 else 0
         
         # Quality thresholds
@@ -707,7 +803,7 @@ EU IMPACT ASSESSMENT DOCUMENTS (Reference Examples)
             # Process EU chunks with document references
             seen_docs = set()
             eu_docs = {}
-            for chunk in eu_chunks[:15]:  # Top 15 EU chunks
+            for chunk in islice(eu_chunks, 15):  # Top 15 EU chunks
                 metadata = chunk.get("metadata", {})
                 doc_ref = metadata.get("swd_reference") or metadata.get("com_reference") or metadata.get("source_document", "Unknown")
                 doc_key = doc_ref
@@ -740,7 +836,7 @@ EU IMPACT ASSESSMENT DOCUMENTS (Reference Examples)
                 })
             
             # Format EU documents
-            for doc_key, doc_info in list(eu_docs.items())[:5]:  # Top 5 EU documents
+            for doc_key, doc_info in islice(eu_docs.items(), 5):  # Top 5 EU documents
                 synthesized += f"\nDocument: {doc_info['reference']}\n"
                 synthesized += f"Policy Domain: {doc_info['domain']} | Year: {doc_info['year']} | Lead DG: {doc_info['lead_dg']}\n"
                 synthesized += "-" * 80 + "\n"
@@ -758,7 +854,7 @@ EU IMPACT ASSESSMENT DOCUMENTS (Reference Examples)
                 synthesized += "=" * 80 + "\n"
                 
                 seen_belgian_docs = set()
-                for chunk in belgian_chunks[:10]:  # Top 10 Belgian chunks
+                for chunk in islice(belgian_chunks, 10):  # Top 10 Belgian chunks
                     metadata = chunk.get("metadata", {})
                     doc_id = metadata.get("document_id") or metadata.get("source_document", "Unknown")
                     
@@ -786,7 +882,7 @@ EU IMPACT ASSESSMENT DOCUMENTS (Reference Examples)
             # Problem definition examples
             if problem_chunks:
                 synthesized += "\n[Problem Definition Patterns]\n"
-                for chunk in problem_chunks[:3]:
+                for chunk in islice(problem_chunks, 3):
                     content = chunk.get("content", "").strip()
                     if len(content) > 500:
                         content = content[:500] + "..."
@@ -797,7 +893,7 @@ EU IMPACT ASSESSMENT DOCUMENTS (Reference Examples)
             # Policy option examples
             if option_chunks:
                 synthesized += "\n[Policy Option Analysis Patterns]\n"
-                for chunk in option_chunks[:3]:
+                for chunk in islice(option_chunks, 3):
                     content = chunk.get("content", "").strip()
                     if len(content) > 500:
                         content = content[:500] + "..."
@@ -808,7 +904,7 @@ EU IMPACT ASSESSMENT DOCUMENTS (Reference Examples)
             # Impact assessment examples
             if impact_chunks:
                 synthesized += "\n[Impact Assessment Patterns]\n"
-                for chunk in impact_chunks[:3]:
+                for chunk in islice(impact_chunks, 3):
                     content = chunk.get("content", "").strip()
                     if len(content) > 500:
                         content = content[:500] + "..."
@@ -819,7 +915,7 @@ EU IMPACT ASSESSMENT DOCUMENTS (Reference Examples)
             # Supporting evidence
             if evidence_chunks:
                 synthesized += "\n[Supporting Evidence and Data]\n"
-                for chunk in evidence_chunks[:5]:
+                for chunk in islice(evidence_chunks, 5):
                     content = chunk.get("content", "").strip()
                     if len(content) > 400:
                         content = content[:400] + "..."
@@ -1131,15 +1227,57 @@ Ensure you provide detailed assessments for ALL 21 themes with clear positive/ne
         """Validate council output quality with RIA-specific criteria."""
         print(f"\n🔍 Validating council output (RIA quality checks)...")
         
-        stage3_result = state.get("stage3_result", {})
+        stage3_result = state.get("stage3_result") or _EMPTY
         content = stage3_result.get("response", "")
         
+        # Retries often re-validate unchanged content; reuse the previous checks
+        with _validation_cache_lock:
+            cached = _validation_cache.get(content)
+            if cached is not None:
+                _validation_cache.move_to_end(content)
+        if cached is None:
+            cached = self._check_council_content(content)
+            with _validation_cache_lock:
+                _validation_cache[content] = cached
+                if len(_validation_cache) > _VALIDATION_CACHE_SIZE:
+                    _validation_cache.popitem(last=False)
+        validation_results = {**cached, "issues": list(cached["issues"])}
+        is_valid = validation_results["is_valid"]
+        
+        quality_metrics = state.get("quality_metrics", {})
+        quality_metrics["council"] = validation_results
+        
+        logger.debug("Council validation: content length %d chars", len(content))
+        logger.debug(
+            "Council validation: background section %s (%d chars)",
+            validation_results["has_background"], validation_results["background_length"]
+        )
+        logger.debug("Council validation: impact themes %d/21", validation_results["themes_found"])
+        logger.debug("Council validation: citations %d", validation_results["citation_count"])
+        logger.debug("Council validation: structure %s", validation_results["has_structure"])
+        print(f"✅ Council validation: {'PASS' if is_valid else 'FAIL'}")
+        if validation_results["issues"]:
+            print(f"   Issues: {', '.join(validation_results['issues'])}")
+        
+        return {**state, "quality_metrics": quality_metrics, "validation_issues": validation_results["issues"]}
+    
+    def _check_council_content(self, content: str) -> Dict[str, Any]:
+        """
+        Run the RIA-specific quality checks on council output.
+        
+        Args:
+            content: Stage 3 response text
+        
+        Returns:
+            Validation results dict (including "issues" and "is_valid")
+        """
         # RIA-specific validation checks
         validation_results = {
             "content_length": len(content),
             "has_background": False,
             "background_length": 0,
             "themes_found": 0,
+            "missing_themes": [],
             "has_citations": False,
             "citation_count": 0,
             "has_structure": False,
@@ -1153,61 +1291,49 @@ Ensure you provide detailed assessments for ALL 21 themes with clear positive/ne
             "Problem Definition",
             "Problem Statement"
         ]
+        content_lower = content.lower()
         for pattern in background_patterns:
-            if pattern.lower() in content.lower():
+            idx = content_lower.find(pattern.lower())
+            if idx != -1:
                 validation_results["has_background"] = True
-                # Extract background section length
-                idx = content.lower().find(pattern.lower())
-                if idx != -1:
-                    # Find next major section
-                    next_sections = ["Executive Summary", "Proposal Overview", "Impact Themes", "Assessment"]
-                    end_idx = len(content)
-                    for section in next_sections:
-                        section_idx = content.lower().find(section.lower(), idx + len(pattern))
-                        if section_idx != -1 and section_idx < end_idx:
-                            end_idx = section_idx
-                    validation_results["background_length"] = end_idx - idx
+                # Extract background section length up to the next major section
+                next_sections = ["Executive Summary", "Proposal Overview", "Impact Themes", "Assessment"]
+                end_idx = len(content)
+                for section in next_sections:
+                    section_idx = content_lower.find(section.lower(), idx + len(pattern))
+                    if section_idx != -1 and section_idx < end_idx:
+                        end_idx = section_idx
+                validation_results["background_length"] = end_idx - idx
                 break
         
-        # Check for all 21 impact themes (look for theme numbers [1] through [21])
-        for theme_num in range(1, 22):
-            theme_patterns = [
-                f"[{theme_num}]",
-                f"Theme {theme_num}",
-                f"Impact Theme {theme_num}",
-                f"#{theme_num}"
-            ]
-            for pattern in theme_patterns:
-                if pattern in content:
-                    validation_results["themes_found"] += 1
-                    break
+        # Check for all 21 impact themes (theme numbers [1] through [21]) and the
+        # required structure sections in a single pass
+        themes = set()
+        sections = set()
+        for match in _VALIDATION_SCAN_RE.finditer(content):
+            bracketed, prefixed, section = match.groups()
+            if section:
+                sections.add(section.lower())
+            elif bracketed:
+                themes.update(_THEMES_BY_BRACKETED.get(bracketed, ()))
+            else:
+                themes.update(_THEMES_BY_PREFIXED[prefixed])
+            if len(themes) == len(_ALL_THEMES) and len(sections) == len(_REQUIRED_SECTIONS):
+                break  # Everything seen; the rest of the content cannot add any
+        validation_results["themes_found"] = len(themes)
+        validation_results["missing_themes"] = sorted(_ALL_THEMES - themes)
         
         # Check for citations (SWD, COM, Belgian RIA references)
-        citation_patterns = [
-            r"SWD\([0-9]{4}\)",
-            r"COM\([0-9]{4}\)",
-            r"Belgian RIA",
-            r"RIA [0-9]{4}",
-            r"SWD\([0-9]{4}\) [0-9]+",
-        ]
-        import re
         citation_count = 0
-        for pattern in citation_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            citation_count += len(matches)
+        for literal, pattern in _CITATION_RES:
+            # A plain substring test is far cheaper than a regex scan that cannot match
+            if literal in content_lower:
+                citation_count += len(pattern.findall(content))
         validation_results["citation_count"] = citation_count
         validation_results["has_citations"] = citation_count > 0
         
         # Check for required structure sections
-        required_sections = [
-            "Executive Summary",
-            "Proposal Overview",
-            "Impact Themes",
-            "Assessment Summary",
-            "Recommendations"
-        ]
-        sections_found = sum(1 for section in required_sections if section.lower() in content.lower())
-        validation_results["has_structure"] = sections_found >= 3
+        validation_results["has_structure"] = len(sections) >= 3
         
         # Determine if valid (all critical checks pass)
         is_valid = (
@@ -1222,27 +1348,17 @@ Ensure you provide detailed assessments for ALL 21 themes with clear positive/ne
         if not validation_results["has_background"] or validation_results["background_length"] < 300:
             validation_results["issues"].append("Background/Problem Definition section is missing or too short")
         if validation_results["themes_found"] < 21:
-            validation_results["issues"].append(f"Only {validation_results['themes_found']}/21 impact themes found")
+            missing = ", ".join(map(str, validation_results["missing_themes"]))
+            validation_results["issues"].append(
+                f"Only {validation_results['themes_found']}/21 impact themes found (missing: {missing})"
+            )
         if not validation_results["has_citations"]:
             validation_results["issues"].append("No citations found (should reference SWD, COM, or Belgian RIA documents)")
         if not validation_results["has_structure"]:
             validation_results["issues"].append("Required structure sections are missing")
         
         validation_results["is_valid"] = is_valid
-        
-        quality_metrics = state.get("quality_metrics", {})
-        quality_metrics["council"] = validation_results
-        
-        print(f"   Content length: {len(content)} chars")
-        print(f"   Background section: {'✓' if validation_results['has_background'] else '✗'} ({validation_results['background_length']} chars)")
-        print(f"   Impact themes: {validation_results['themes_found']}/21")
-        print(f"   Citations: {validation_results['citation_count']}")
-        print(f"   Structure: {'✓' if validation_results['has_structure'] else '✗'}")
-        print(f"✅ Council validation: {'PASS' if is_valid else 'FAIL'}")
-        if validation_results["issues"]:
-            print(f"   Issues: {', '.join(validation_results['issues'])}")
-        
-        return {**state, "quality_metrics": quality_metrics, "validation_issues": validation_results["issues"]}
+        return validation_results
     
     def council_validation_decision(self, state: RIAState) -> str:
         """Decision function for council validation - refine if needed."""
@@ -1270,7 +1386,7 @@ Ensure you provide detailed assessments for ALL 21 themes with clear positive/ne
         retry_count = state.get("council_refinement_count", 0)
         retry_count += 1
         
-        stage3_result = state.get("stage3_result", {})
+        stage3_result = state.get("stage3_result") or _EMPTY
         current_content = stage3_result.get("response", "")
         validation_issues = state.get("validation_issues", [])
         proposal = state.get("proposal", "")
@@ -1303,8 +1419,8 @@ Generate the complete refined assessment:"""
         
         # Use OpenAI for refinement (fast and reliable)
         try:
-            from openai import OpenAI
-            import os
+            if not OPENAI_AVAILABLE:
+                raise ImportError("openai package not installed")
             
             api_key = os.getenv("OPENAI_API_KEY")
             if api_key:
@@ -1343,7 +1459,7 @@ Generate the complete refined assessment:"""
         """Extract sections from council output."""
         print(f"\n📑 Extracting RIA sections...")
         
-        stage3_result = state.get("stage3_result", {})
+        stage3_result = state.get("stage3_result") or _EMPTY
         content = stage3_result.get("response", "")
         
         sections = {}
@@ -1352,123 +1468,80 @@ Generate the complete refined assessment:"""
         # EU-style analysis is used for depth, but structure follows Belgian RIA format
         
         # Extract Background/Problem Definition section (MOST IMPORTANT - should be first)
-        background_patterns = [
-            r"1\.\s*Background\s+and\s+Problem\s+Definition",
-            r"Background\s+and\s+Problem\s+Definition",
-            r"1\.\s*Background",
-            r"Background",
-            r"Problem\s+Definition"
-        ]
-        
         background_match = None
-        for pattern in background_patterns:
-            background_match = re.search(pattern, content, re.IGNORECASE)
+        for pattern in _BACKGROUND_RES:
+            background_match = pattern.search(content)
             if background_match:
                 break
         
         if background_match:
             start = background_match.end()
             # Look for next section (Executive Summary, Proposal Overview, or numbered section 2)
-            next_section_pattern = r"2\.\s*(Executive\s+Summary|Proposal\s+Overview|Impact\s+Themes)|Executive\s+Summary|Proposal\s+Overview"
-            next_match = re.search(next_section_pattern, content[start:], re.IGNORECASE)
-            end = start + (next_match.start() if next_match else min(2000, len(content) - start))
+            next_match = _BACKGROUND_END_RE.search(content, start)
+            end = next_match.start() if next_match else start + min(2000, len(content) - start)
             sections["Background and Problem Definition"] = content[start:end].strip()
         else:
             sections["Background and Problem Definition"] = ""
         
         # Extract Executive Summary
-        exec_summary_patterns = [
-            r"2\.\s*Executive\s+Summary",
-            r"Executive\s+Summary"
-        ]
         exec_match = None
-        for pattern in exec_summary_patterns:
-            exec_match = re.search(pattern, content, re.IGNORECASE)
+        for pattern in _EXEC_SUMMARY_RES:
+            exec_match = pattern.search(content)
             if exec_match:
                 break
         
         if exec_match:
             start = exec_match.end()
-            next_section_pattern = r"3\.\s*(Proposal\s+Overview|Impact\s+Themes)|Proposal\s+Overview|21\s+Impact\s+Themes"
-            next_match = re.search(next_section_pattern, content[start:], re.IGNORECASE)
-            end = start + (next_match.start() if next_match else min(1000, len(content) - start))
+            next_match = _EXEC_SUMMARY_END_RE.search(content, start)
+            end = next_match.start() if next_match else start + min(1000, len(content) - start)
             sections["Executive Summary"] = content[start:end].strip()
         else:
             sections["Executive Summary"] = ""
         
         # Extract Proposal Overview
-        proposal_patterns = [
-            r"3\.\s*Proposal\s+Overview",
-            r"Proposal\s+Overview"
-        ]
         proposal_match = None
-        for pattern in proposal_patterns:
-            proposal_match = re.search(pattern, content, re.IGNORECASE)
+        for pattern in _PROPOSAL_OVERVIEW_RES:
+            proposal_match = pattern.search(content)
             if proposal_match:
                 break
         
         if proposal_match:
             start = proposal_match.end()
-            next_section_pattern = r"4\.\s*21\s+Impact\s+Themes|21\s+Impact\s+Themes"
-            next_match = re.search(next_section_pattern, content[start:], re.IGNORECASE)
-            end = start + (next_match.start() if next_match else min(1000, len(content) - start))
+            next_match = _PROPOSAL_OVERVIEW_END_RE.search(content, start)
+            end = next_match.start() if next_match else start + min(1000, len(content) - start)
             sections["Proposal Overview"] = content[start:end].strip()
         else:
             sections["Proposal Overview"] = ""
         
-        # Extract 21 Belgian impact themes assessments (using both French and English names)
-        theme_assessments = {}
-        for theme_num, theme_info in self.BELGIAN_IMPACT_THEMES.items():
-            theme_name = theme_info["name"]
-            # Try both French and English names
-            french_name = theme_name.split(" / ")[0]
-            english_name = theme_name.split(" / ")[1] if " / " in theme_name else theme_name
-            
-            # Look for theme in content (case insensitive, try both names)
-            pattern_fr = rf"\b{re.escape(french_name)}\b"
-            pattern_en = rf"\b{re.escape(english_name)}\b"
-            pattern_num = rf"\[{theme_num}\]|Theme {theme_num}|Thème {theme_num}"
-            
+        # Extract and format the 21 Belgian impact theme assessments in one pass
+        # (theme names are matched in French, then English, then by number)
+        theme_sections = []
+        assessed_count = 0
+        for theme_num, english_name, keywords, theme_patterns, next_theme_re in _THEME_SECTION_PATTERNS:
             match = None
-            for pattern in [pattern_fr, pattern_en, pattern_num]:
-                match = re.search(pattern, content, re.IGNORECASE)
+            for pattern in theme_patterns:
+                match = pattern.search(content)
                 if match:
                     break
             
+            assessment = ""
             if match:
                 # Extract assessment for this theme (next 200-1000 chars or until next theme)
                 start = match.end()
-                # Look for next theme number or end of content
-                next_theme_pattern = rf"\[{theme_num + 1}\]|Theme {theme_num + 1}|Thème {theme_num + 1}"
-                next_match = re.search(next_theme_pattern, content[start:start+1500], re.IGNORECASE)
-                end = start + (next_match.start() if next_match else min(1000, len(content) - start))
-                theme_assessments[theme_num] = {
-                    "name": english_name,
-                    "assessment": content[start:end].strip()
-                }
-            else:
-                theme_assessments[theme_num] = {
-                    "name": english_name,
-                    "assessment": ""
-                }
-        
-        # Format theme assessments in Belgian RIA structure
-        theme_sections = []
-        for theme_num in sorted(theme_assessments.keys()):
-            theme_data = theme_assessments[theme_num]
-            theme_name = theme_data["name"]
-            assessment = theme_data["assessment"]
-            keywords = self.BELGIAN_IMPACT_THEMES[theme_num]["keywords"]
+                next_match = next_theme_re.search(content, start, start + 1500)
+                end = next_match.start() if next_match else start + min(1000, len(content) - start)
+                assessment = content[start:end].strip()
             
+            # Format in Belgian RIA structure
             if assessment:
-                theme_sections.append(f"[{theme_num}] {theme_name}\nKeywords: {keywords}\n\nAssessment:\n{assessment}\n")
+                assessed_count += 1
+                theme_sections.append(f"[{theme_num}] {english_name}\nKeywords: {keywords}\n\nAssessment:\n{assessment}\n")
             else:
-                theme_sections.append(f"[{theme_num}] {theme_name}\nKeywords: {keywords}\n\nAssessment: Not assessed\n")
+                theme_sections.append(f"[{theme_num}] {english_name}\nKeywords: {keywords}\n\nAssessment: Not assessed\n")
         
         sections["21 Belgian Impact Themes Assessment"] = "\n" + "="*80 + "\n".join(theme_sections)
         
-        print(f"✅ Extracted {len([s for s in sections.values() if s])} sections")
-        assessed_count = len([a for a in theme_assessments.values() if a.get("assessment", "")])
+        print(f"✅ Extracted {sum(1 for s in sections.values() if s)} sections")
         print(f"✅ Extracted {assessed_count}/21 impact theme assessments")
         
         return {**state, "structured_sections": sections}
@@ -1477,7 +1550,7 @@ Generate the complete refined assessment:"""
         """Structure assessment into final format."""
         print(f"\n📋 Structuring assessment...")
         
-        stage3_result = state.get("stage3_result", {})
+        stage3_result = state.get("stage3_result") or _EMPTY
         sections = state.get("structured_sections", {})
         chunks = state.get("merged_chunks", [])
         
@@ -1520,11 +1593,11 @@ Generate the complete refined assessment:"""
         print(f"\n📊 Calculating quality metrics...")
         
         quality_metrics = state.get("quality_metrics", {})
-        structured = state.get("structured_assessment", {})
+        structured = state.get("structured_assessment") or _EMPTY
         
         # Overall quality score
-        sections = structured.get("sections", {})
-        sections_filled = len([s for s in sections.values() if s])
+        sections = structured.get("sections") or _EMPTY
+        sections_filled = sum(map(bool, sections.values()))
         total_sections = len(sections)
         completeness = sections_filled / total_sections if total_sections > 0 else 0
         
@@ -1582,10 +1655,14 @@ Generate the complete refined assessment:"""
         # For now, just pass through structured assessment
         # In production, this would generate PDF, DOCX, HTML, etc.
         
+        # Reuse the timestamp stamped in structure_assessment so the report and
+        # its metadata agree; only read the clock if it is missing
+        generated_at = structured.get("metadata", _EMPTY).get("generated_at") or datetime.now().isoformat()
+        
         final_report = {
             **structured,
             "formats": ["json"],  # Could add "pdf", "docx", "html"
-            "generated_at": datetime.now().isoformat()
+            "generated_at": generated_at
         }
         
         print(f"✅ Report generated")
@@ -1598,7 +1675,7 @@ Generate the complete refined assessment:"""
         
         proposal = state.get("proposal", "")
         structured = state.get("structured_assessment", {})
-        features = state.get("features", {})
+        features = state.get("features") or _EMPTY
         
         kb_data = {
             "proposal_text": proposal,
@@ -1648,8 +1725,8 @@ Generate the complete refined assessment:"""
     async def _openai_fallback(self, state: RIAState, query: str) -> RIAState:
         """Fallback to OpenAI when council is not available."""
         try:
-            from openai import OpenAI
-            import os
+            if not OPENAI_AVAILABLE:
+                raise ImportError("openai package not installed")
             
             api_key = os.getenv("OPENAI_API_KEY")
             if not api_key:
@@ -1757,10 +1834,69 @@ Use EU analytical depth but maintain Belgian RIA form structure."""
         return {**state, "errors": errors}
 
 
+def _build_theme_section_patterns(themes: Dict[int, Dict[str, str]]) -> Tuple[tuple, ...]:
+    """
+    Compile the per-theme regexes used by extract_ria_sections.
+    
+    Args:
+        themes: Theme number -> {"name": "French / English", "keywords": ...}
+    
+    Returns:
+        Tuple of (theme_num, english_name, keywords, search patterns in priority
+        order, pattern marking the start of the next theme), sorted by theme number
+    """
+    compiled = []
+    for theme_num in sorted(themes):
+        theme_name = themes[theme_num]["name"]
+        french_name = theme_name.split(" / ")[0]
+        english_name = theme_name.split(" / ")[1] if " / " in theme_name else theme_name
+        theme_patterns = tuple(re.compile(p, re.IGNORECASE) for p in (
+            rf"\b{re.escape(french_name)}\b",
+            rf"\b{re.escape(english_name)}\b",
+            rf"\[{theme_num}\]|Th[eè]me {theme_num}",
+        ))
+        # "Theme"/"Thème" share one branch, so a position that is not "[" or "Th"
+        # fails on its first character instead of being retried per alternative
+        next_theme_re = re.compile(rf"\[{theme_num + 1}\]|Th[eè]me {theme_num + 1}", re.IGNORECASE)
+        compiled.append((theme_num, english_name, themes[theme_num]["keywords"], theme_patterns, next_theme_re))
+    return tuple(compiled)
+
+
+_THEME_SECTION_PATTERNS = _build_theme_section_patterns(RIAWorkflow.BELGIAN_IMPACT_THEMES)
+
+
 # ============================================================================
 # Async Execution Wrapper
 # ============================================================================
 
+# Compiled workflows keyed by (vector_store_path, knowledge_graph_path). Nodes keep
+# no per-run state on the instance, so one compiled graph serves every run.
+_workflows: Dict[tuple, RIAWorkflow] = {}
+_workflow_lock = threading.Lock()
+
+
+def _get_workflow(
+    vector_store_path: str = "vector_store",
+    knowledge_graph_path: str = "knowledge_graph.pkl"
+) -> RIAWorkflow:
+    """Build (or return the already-built) workflow for a pair of resource paths."""
+    key = (vector_store_path, knowledge_graph_path)
+    with _workflow_lock:
+        workflow = _workflows.get(key)
+        if workflow is None:
+            workflow = RIAWorkflow(vector_store_path, knowledge_graph_path)
+            # Only share a fully loaded workflow so a missing index is retried next run
+            if workflow.vector_store is not None and workflow.knowledge_graph is not None:
+                _workflows[key] = workflow
+        return workflow
+
+
+# Run workflows with reasonable recursion limit
+# Normal flow: ingest -> extract -> route -> retrieve -> merge -> check -> synthesize -> validate -> council -> extract -> structure -> quality -> review -> report -> kb -> END
+# That's about 15-20 steps, so 100 should be plenty even with a few retries
+_RUN_CONFIG = {"recursion_limit": 100}
+
+
 async def run_ria_workflow(
     proposal: str,
     context: Optional[Dict[str, Any]] = None,
@@ -1779,7 +1915,7 @@ async def run_ria_workflow(
     Returns:
         Final state with generated assessment
     """
-    workflow = RIAWorkflow(vector_store_path, knowledge_graph_path)
+    workflow = _get_workflow(vector_store_path, knowledge_graph_path)
     
     # Initial state
     initial_state: RIAState = {
@@ -1787,15 +1923,51 @@ async def run_ria_workflow(
         "context": context or {}
     }
     
-    # Run workflow with reasonable recursion limit
-    # Normal flow: ingest -> extract -> route -> retrieve -> merge -> check -> synthesize -> validate -> council -> extract -> structure -> quality -> review -> report -> kb -> END
-    # That's about 15-20 steps, so 100 should be plenty even with a few retries
-    config = {"recursion_limit": 100}
-    final_state = await workflow.graph.ainvoke(initial_state, config=config)
+    final_state = await workflow.graph.ainvoke(initial_state, config=_RUN_CONFIG)
     
     return final_state
 
 
+async def run_ria_workflow_stream(
+    proposal: str,
+    context: Optional[Dict[str, Any]] = None,
+    vector_store_path: str = "vector_store",
+    knowledge_graph_path: str = "knowledge_graph.pkl"
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run the complete RIA workflow, yielding the state after every step.
+    
+    Callers see each node's results as soon as it finishes instead of waiting for
+    the whole run; the last state yielded is what run_ria_workflow returns.
+    
+    Args:
+        proposal: Regulatory proposal text
+        context: Additional context (jurisdiction, category, year, etc.)
+        vector_store_path: Path to vector store directory
+        knowledge_graph_path: Path to knowledge graph pickle file
+    
+    Yields:
+        Workflow state after each step
+    """
+    workflow = _get_workflow(vector_store_path, knowledge_graph_path)
+    
+    # Initial state
+    initial_state: RIAState = {
+        "proposal": proposal,
+        "context": context or {}
+    }
+    
+    async for state in workflow.graph.astream(initial_state, config=_RUN_CONFIG, stream_mode="values"):
+        yield state
+
+
+# Warm the shared resources in the background at import time so the first
+# workflow run does not pay the index/model load inside retrieval
+if os.getenv("RIA_EAGER_LOAD_VECTOR_STORE") == "1":
+    threading.Thread(target=get_vector_store, daemon=True).start()
+    threading.Thread(target=get_knowledge_graph, daemon=True).start()
+
+
 # ============================================================================
 # Main Entry Point
 # ============================================================================
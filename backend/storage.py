@@ -1,5 +1,6 @@
 """JSON-based storage for conversations."""
 
+import heapq
 import json
 import os
 from datetime import datetime
@@ -14,10 +15,37 @@ def ensure_data_dir():
 
 
 def get_conversation_path(conversation_id: str) -> str:
-    """Get the file path for a conversation."""
+    """
+    Get the file path for a conversation.
+
+    Conversations are sharded into sub-directories keyed by the first two
+    characters of the id (uuid4 hex), so no single directory grows unbounded.
+    """
+    return os.path.join(DATA_DIR, conversation_id[:2], f"{conversation_id}.json")
+
+
+def _get_legacy_conversation_path(conversation_id: str) -> str:
+    """Get the pre-sharding flat file path for a conversation."""
     return os.path.join(DATA_DIR, f"{conversation_id}.json")
 
 
+def _write_conversation(conversation: Dict[str, Any], durable: bool = False):
+    """
+    Write a conversation to its sharded path, creating the shard if needed.
+
+    Routine writes are left to the page cache; pass durable=True to fsync
+    before returning (used once a council response is complete).
+    """
+    path = get_conversation_path(conversation['id'])
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps(conversation, indent=2).encode('utf-8')
+    with open(path, 'wb', buffering=1024 * 1024) as f:
+        f.write(data)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+
+
 def create_conversation(conversation_id: str) -> Dict[str, Any]:
     """
     Create a new conversation.
@@ -38,9 +66,7 @@ def create_conversation(conversation_id: str) -> Dict[str, Any]:
     }
 
     # Save to file
-    path = get_conversation_path(conversation_id)
-    with open(path, 'w') as f:
-        json.dump(conversation, f, indent=2)
+    _write_conversation(conversation)
 
     return conversation
 
@@ -58,64 +84,97 @@ def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
     path = get_conversation_path(conversation_id)
 
     if not os.path.exists(path):
-        return None
+        # Fall back to the flat layout used before sharding
+        path = _get_legacy_conversation_path(conversation_id)
+        if not os.path.exists(path):
+            return None
 
     with open(path, 'r') as f:
         return json.load(f)
 
 
-def save_conversation(conversation: Dict[str, Any]):
+def save_conversation(conversation: Dict[str, Any], durable: bool = False):
     """
     Save a conversation to storage.
 
     Args:
         conversation: Conversation dict to save
+        durable: Whether to fsync the file before returning
     """
     ensure_data_dir()
 
-    path = get_conversation_path(conversation['id'])
-    with open(path, 'w') as f:
-        json.dump(conversation, f, indent=2)
-
-
-def list_conversations() -> List[Dict[str, Any]]:
+    _write_conversation(conversation, durable=durable)
+
+    # Drop any pre-sharding copy so it cannot shadow the new file in listings
+    legacy_path = _get_legacy_conversation_path(conversation['id'])
+    if os.path.exists(legacy_path):
+        os.remove(legacy_path)
+
+
+def _iter_conversation_files():
+    """Yield paths of all conversation files (sharded and legacy flat layout)."""
+    with os.scandir(DATA_DIR) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                with os.scandir(entry.path) as shard:
+                    for item in shard:
+                        if item.name.endswith('.json'):
+                            yield item.path
+            elif entry.name.endswith('.json'):
+                yield entry.path
+
+
+def _iter_conversation_metadata():
+    """Yield metadata dicts for all stored conversations, one file at a time."""
+    for path in _iter_conversation_files():
+        with open(path, 'r') as f:
+            data = json.load(f)
+        # Return metadata only
+        yield {
+            "id": data["id"],
+            "created_at": data["created_at"],
+            "title": data.get("title", "New Conversation"),
+            "message_count": len(data["messages"])
+        }
+
+
+def list_conversations(limit: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     List all conversations (metadata only).
 
+    Args:
+        limit: Optional maximum number of conversations to return
+
     Returns:
-        List of conversation metadata dicts
+        List of conversation metadata dicts, newest first
     """
     ensure_data_dir()
 
-    conversations = []
-    for filename in os.listdir(DATA_DIR):
-        if filename.endswith('.json'):
-            path = os.path.join(DATA_DIR, filename)
-            with open(path, 'r') as f:
-                data = json.load(f)
-                # Return metadata only
-                conversations.append({
-                    "id": data["id"],
-                    "created_at": data["created_at"],
-                    "title": data.get("title", "New Conversation"),
-                    "message_count": len(data["messages"])
-                })
+    sort_key = lambda x: x["created_at"]
 
-    # Sort by creation time, newest first
-    conversations.sort(key=lambda x: x["created_at"], reverse=True)
+    # With a limit, keep only the newest `limit` entries in memory
+    if limit is not None:
+        return heapq.nlargest(limit, _iter_conversation_metadata(), key=sort_key)
 
-    return conversations
+    # Sort by creation time, newest first
+    return sorted(_iter_conversation_metadata(), key=sort_key, reverse=True)
 
 
-def add_user_message(conversation_id: str, content: str):
+def add_user_message(
+    conversation_id: str,
+    content: str,
+    *,
+    preloaded: Optional[Dict[str, Any]] = None
+):
     """
     Add a user message to a conversation.
 
     Args:
         conversation_id: Conversation identifier
         content: User message content
+        preloaded: Conversation dict the caller already loaded (skips re-reading it)
     """
-    conversation = get_conversation(conversation_id)
+    conversation = preloaded or get_conversation(conversation_id)
     if conversation is None:
         raise ValueError(f"Conversation {conversation_id} not found")
 
@@ -131,7 +190,9 @@ def add_assistant_message(
     conversation_id: str,
     stage1: List[Dict[str, Any]],
     stage2: List[Dict[str, Any]],
-    stage3: Dict[str, Any]
+    stage3: Dict[str, Any],
+    *,
+    preloaded: Optional[Dict[str, Any]] = None
 ):
     """
     Add an assistant message with all 3 stages to a conversation.
@@ -141,8 +202,9 @@ def add_assistant_message(
         stage1: List of individual model responses
         stage2: List of model rankings
         stage3: Final synthesized response
+        preloaded: Conversation dict the caller already loaded (skips re-reading it)
     """
-    conversation = get_conversation(conversation_id)
+    conversation = preloaded or get_conversation(conversation_id)
     if conversation is None:
         raise ValueError(f"Conversation {conversation_id} not found")
 
@@ -153,18 +215,25 @@ def add_assistant_message(
         "stage3": stage3
     })
 
-    save_conversation(conversation)
+    # The completed council response is the write worth making durable
+    save_conversation(conversation, durable=True)
 
 
-def update_conversation_title(conversation_id: str, title: str):
+def update_conversation_title(
+    conversation_id: str,
+    title: str,
+    *,
+    preloaded: Optional[Dict[str, Any]] = None
+):
     """
     Update the title of a conversation.
 
     Args:
         conversation_id: Conversation identifier
         title: New title for the conversation
+        preloaded: Conversation dict the caller already loaded (skips re-reading it)
     """
-    conversation = get_conversation(conversation_id)
+    conversation = preloaded or get_conversation(conversation_id)
     if conversation is None:
         raise ValueError(f"Conversation {conversation_id} not found")
 
@@ -8,8 +8,16 @@ Hybrid retrieval layer combining:
 """
 
 import json
-import pickle
+import os
+import random
+import re
+import sqlite3
+import string
+import threading
+import time
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
@@ -17,16 +25,29 @@ from datetime import datetime
 import hashlib
 
 try:
-    from rank_bm25 import BM25Okapi
-    BM25_AVAILABLE = True
+    from openai import OpenAI, RateLimitError
+    OPENAI_AVAILABLE = True
 except ImportError:
-    BM25_AVAILABLE = False
+    OPENAI_AVAILABLE = False
 
 try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
 except ImportError:
-    OPENAI_AVAILABLE = False
+    PYARROW_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
 
 # Lazy import for sentence_transformers to avoid Keras issues when using OpenAI
 SENTENCE_TRANSFORMERS_AVAILABLE = None
@@ -47,6 +68,77 @@ def _get_sentence_transformer():
     return _SentenceTransformer if SENTENCE_TRANSFORMERS_AVAILABLE else None
 
 
+# Truncate text if too long (OpenAI embeddings have 8K token limit)
+# Rough estimate: 1 token ≈ 4 characters, so 8K tokens ≈ 32K chars
+# Use 30K chars to be safe
+MAX_EMBEDDING_CHARS = 30000
+
+# Keep each batched embedding request well under the ~300K tokens per request limit
+MAX_BATCH_CHARS = 1_000_000
+
+# Retries for a rate-limited embedding request (exponential backoff, or Retry-After)
+EMBEDDING_MAX_RETRIES = 5
+
+# BM25 tokens: runs of word characters (matched against lowercased text)
+_TOKEN_RE = re.compile(r'\b\w+\b')
+
+# ASCII fast path: lowercase word characters, turn everything else into spaces,
+# then str.split() yields the same tokens as _TOKEN_RE without the regex engine
+_ASCII_WORD_CHARS = frozenset(string.ascii_letters + string.digits + "_")
+_ASCII_TOKEN_TABLE = str.maketrans({
+    chr(i): chr(i).lower() if chr(i) in _ASCII_WORD_CHARS else " "
+    for i in range(128)
+})
+
+# Approximate nearest neighbour (FAISS HNSW) dense search: only worth it on large
+# stores; below this size the exact matrix-vector product is fast enough
+ANN_MIN_ENTRIES = 50_000
+ANN_HNSW_M = 32
+ANN_EF_CONSTRUCTION = 200
+# Fetch this many times top_k ANN candidates so enough survive metadata filtering
+ANN_OVERFETCH = 3
+# Rows (evenly spaced over the store) used to train an int8 ANN index's per-dimension ranges
+ANN_TRAIN_ROWS = 16384
+
+# Rows per block when scoring a float16 dense matrix: each block is upcast to
+# float32 for the matrix-vector product (numpy has no fast float16 BLAS path)
+DENSE_SCORE_BLOCK_ROWS = 4096
+
+# Query embeddings kept in memory per store (repeated queries skip the model call)
+QUERY_EMBEDDING_CACHE_SIZE = 256
+
+# Token ids of an entry with no tokens
+_NO_TOKENS = np.zeros(0, dtype=np.int32)
+
+# Entry file formats, in the order load() looks for them (entries.json is legacy)
+_ENTRY_FILES = ("entries.parquet", "entries.ndjson", "entries.json")
+
+
+def _json_line(obj: Any) -> bytes:
+    """Serialize one NDJSON record (orjson when installed)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _parse_json(data: bytes) -> Any:
+    """Parse one JSON document (orjson when installed)."""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _truncate_for_embedding(text: str) -> str:
+    """Truncate text to MAX_EMBEDDING_CHARS, preferring a sentence boundary."""
+    if len(text) > MAX_EMBEDDING_CHARS:
+        text = text[:MAX_EMBEDDING_CHARS]
+        # Try to truncate at a sentence boundary if possible
+        last_period = text.rfind('.')
+        last_newline = text.rfind('\n')
+        truncate_at = max(last_period, last_newline)
+        if truncate_at > MAX_EMBEDDING_CHARS * 0.8:  # Only if we find a good break point
+            text = text[:truncate_at + 1]
+    return text
+
+
 @dataclass
 class VectorStoreEntry:
     """Entry in the vector store."""
@@ -54,7 +146,266 @@ class VectorStoreEntry:
     content: str
     dense_vector: Optional[np.ndarray] = None
     metadata: Dict[str, Any] = None
-    tokens: List[str] = None  # For BM25
+    token_ids: Optional[np.ndarray] = None  # For BM25 (int32 ids into VectorStore.vocab)
+
+
+class BM25Index:
+    """
+    Okapi BM25 over CSR posting lists (term id -> doc ids / score weights).
+    
+    Scores match rank_bm25.BM25Okapi (to float32 precision), but a query only touches the postings of
+    its own terms, as NumPy slices, instead of looping over every document.
+    Terms are integer ids from the owning store's vocabulary.
+    """
+    
+    def __init__(
+        self,
+        corpus: List[np.ndarray],
+        vocab_size: int,
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25
+    ):
+        """
+        Index a corpus of token id arrays.
+        
+        Args:
+            corpus: One int32 token id array per document
+            vocab_size: Number of term ids (ids must be < vocab_size)
+            k1: Term frequency saturation
+            b: Document length normalization
+            epsilon: Floor for negative IDF values, as a fraction of the mean IDF
+        """
+        self.k1 = k1
+        self.b = b
+        self.corpus_size = len(corpus)
+        self.doc_len = np.array([len(ids) for ids in corpus], dtype=np.float64)
+        
+        # Per-document (term id, tf) pairs
+        doc_ids = []
+        term_ids = []
+        term_freqs = []
+        for doc_id, ids in enumerate(corpus):
+            terms, freqs = np.unique(ids, return_counts=True)
+            term_ids.append(terms)
+            term_freqs.append(freqs)
+            doc_ids.append(np.full(len(terms), doc_id, dtype=np.int32))
+        
+        # Group postings by term (CSR layout)
+        term_ids_arr = np.concatenate(term_ids).astype(np.int64) if term_ids else np.zeros(0, dtype=np.int64)
+        order = np.argsort(term_ids_arr, kind="stable")
+        self.postings_doc = (np.concatenate(doc_ids) if doc_ids else np.zeros(0, dtype=np.int32))[order]
+        postings_tf = (np.concatenate(term_freqs) if term_freqs else np.zeros(0))[order].astype(np.float64)
+        doc_freq = np.bincount(term_ids_arr, minlength=vocab_size)
+        self.indptr = np.concatenate(([0], np.cumsum(doc_freq)))
+        
+        self.avgdl = self.doc_len.sum() / self.corpus_size if self.corpus_size else 0.0
+        
+        # IDF with negative values floored to epsilon * mean IDF (as in BM25Okapi).
+        # The mean only covers terms that occur in this corpus.
+        idf = np.log(self.corpus_size - doc_freq + 0.5) - np.log(doc_freq + 0.5)
+        present = doc_freq > 0
+        if present.any():
+            idf[present & (idf < 0)] = epsilon * idf[present].mean()
+        self.idf = idf
+        
+        # Everything but the query is fixed once the corpus is indexed, so each
+        # posting's score contribution idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / avgdl))
+        # is computed here once; a query only sums the weights of its terms' postings.
+        doc_norm = k1 * (1 - b + b * self.doc_len / self.avgdl) if self.corpus_size else self.doc_len
+        weights = self.idf[np.repeat(np.arange(len(doc_freq)), doc_freq)] * (
+            postings_tf * (k1 + 1) / (postings_tf + doc_norm[self.postings_doc])
+        )
+        self.postings_weight = np.ascontiguousarray(weights, dtype=np.float32)
+        
+        # Each term's largest possible contribution to any score (for MaxScore pruning)
+        self.max_score = np.zeros(len(doc_freq), dtype=np.float64)
+        if len(weights):
+            self.max_score[present] = np.maximum.reduceat(self.postings_weight, self.indptr[:-1][present])
+    
+    # Arrays written by save() and restored by load()
+    _ARRAYS = ("doc_len", "postings_doc", "postings_weight", "indptr", "idf", "max_score")
+    
+    def save(self, path: Path):
+        """Save the index arrays (and parameters) to an .npz file."""
+        np.savez(
+            path,
+            k1=self.k1,
+            b=self.b,
+            avgdl=self.avgdl,
+            **{name: getattr(self, name) for name in self._ARRAYS}
+        )
+    
+    @classmethod
+    def load(cls, path: Path) -> "BM25Index":
+        """Load an index written by save() without re-indexing the corpus."""
+        index = cls.__new__(cls)
+        with np.load(path) as data:
+            index.k1 = float(data["k1"])
+            index.b = float(data["b"])
+            index.avgdl = float(data["avgdl"])
+            for name in cls._ARRAYS:
+                setattr(index, name, data[name])
+        index.corpus_size = len(index.doc_len)
+        return index
+    
+    def _term_scores(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (doc ids, score contributions) for one term's postings."""
+        start, end = self.indptr[term_id], self.indptr[term_id + 1]
+        return self.postings_doc[start:end], self.postings_weight[start:end]
+    
+    def get_scores(self, query_ids: List[int]) -> np.ndarray:
+        """
+        Score every document against a query.
+        
+        Args:
+            query_ids: Query token ids (repeated ids count repeatedly)
+        
+        Returns:
+            (corpus_size,) array of BM25 scores
+        """
+        scores = np.zeros(self.corpus_size, dtype=np.float64)
+        for term_id in query_ids:
+            if term_id >= len(self.idf):
+                continue
+            docs, contributions = self._term_scores(term_id)
+            scores[docs] += contributions
+        return scores
+    
+    def top_k(
+        self,
+        query_ids: List[int],
+        k: int,
+        candidates: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k best-scoring documents with MaxScore pruning.
+        
+        Terms are processed in order of decreasing max_score. Once the k-th best
+        score so far beats what the remaining terms could add to an unseen
+        document, only documents that can still reach the top k keep being
+        scored; their final scores are exact.
+        
+        Args:
+            query_ids: Query token ids (repeated ids count repeatedly)
+            k: Number of documents to return
+            candidates: Optional (corpus_size,) bool mask of documents allowed in the result
+        
+        Returns:
+            (doc ids, scores), best first; only documents matching a query term
+        """
+        empty = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float64))
+        terms = [t for t in query_ids if t < len(self.idf)]
+        if k <= 0 or not terms:
+            return empty
+        
+        terms, counts = np.unique(terms, return_counts=True)
+        if (self.idf[terms] < 0).any():
+            # The pruning bounds assume scores only grow; score exhaustively instead
+            scores = self.get_scores(query_ids)
+            hits = np.zeros(self.corpus_size, dtype=bool)
+            for term_id in terms:
+                hits[self.postings_doc[self.indptr[term_id]:self.indptr[term_id + 1]]] = True
+            if candidates is not None:
+                hits &= candidates
+            return self._best(scores, np.flatnonzero(hits), k)
+        
+        upper = self.max_score[terms] * counts
+        order = np.argsort(-upper, kind="stable")
+        terms, counts, upper = terms[order], counts[order], upper[order]
+        # remaining[i]: most that terms after i can add to any document
+        remaining = np.append(np.cumsum(upper[::-1])[::-1][1:], 0.0)
+        
+        scores = np.zeros(self.corpus_size, dtype=np.float64)
+        live = np.zeros(self.corpus_size, dtype=bool)  # scored and still able to reach the top k
+        pruning = False
+        for i, (term_id, count) in enumerate(zip(terms, counts)):
+            docs, contributions = self._term_scores(term_id)
+            keep = live[docs] if pruning else (candidates[docs] if candidates is not None else None)
+            if keep is not None:
+                docs, contributions = docs[keep], contributions[keep]
+            scores[docs] += count * contributions
+            live[docs] = True
+            
+            hits = np.flatnonzero(live)
+            if len(hits) < k:
+                continue
+            threshold = np.partition(scores[hits], len(hits) - k)[len(hits) - k]
+            if not pruning and threshold > remaining[i]:
+                # Documents not scored yet can no longer reach the top k
+                pruning = True
+            if pruning:
+                live[hits[scores[hits] + remaining[i] < threshold]] = False
+        
+        return self._best(scores, np.flatnonzero(live), k)
+    
+    @staticmethod
+    def _best(scores: np.ndarray, hits: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the k highest-scoring of the given doc ids, best first, with their scores."""
+        best = hits[np.argsort(-scores[hits], kind="stable")[:k]]
+        return best.astype(np.int32), scores[best]
+
+
+class EmbeddingCache:
+    """
+    Persistent SQLite cache of dense embeddings.
+    
+    Keyed by the SHA-256 of (embedding model, text), so unchanged chunks are not
+    re-embedded when a vector store is rebuilt.
+    """
+    
+    # Keys per lookup query (stays under SQLite's bound-parameter limit)
+    _LOOKUP_BATCH = 500
+    
+    def __init__(self, path: str):
+        """
+        Open (or create) the cache.
+        
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        # Shared by threads searching the same store; access is serialized by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+    
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        """Cache key for a text embedded with a given model."""
+        return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+    
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Return the cached float32 vectors for whichever of the keys are present."""
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(keys), self._LOOKUP_BATCH):
+                batch = keys[start:start + self._LOOKUP_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32)
+        return found
+    
+    def put_many(self, items: List[Tuple[str, np.ndarray]]):
+        """Store (key, vector) pairs."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                ((key, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in items)
+            )
+            self._conn.commit()
+
+
+def _metadata_matches(entry_value: Any, value: Any) -> bool:
+    """Whether one metadata value satisfies a filter value (list values match any item)."""
+    if isinstance(entry_value, list):
+        return value in entry_value
+    return entry_value == value
 
 
 class VectorStore:
@@ -64,7 +415,12 @@ class VectorStore:
         self,
         embedding_model: str = "text-embedding-3-small",
         use_local_model: bool = False,
-        local_model_name: str = "all-MiniLM-L6-v2"
+        local_model_name: str = "all-MiniLM-L6-v2",
+        embedding_batch_size: int = 128,
+        embedding_workers: int = 4,
+        embedding_cache_path: Optional[str] = None,
+        dense_dtype: str = "float32",
+        ann_int8: bool = False
     ):
         """
         Initialize vector store.
@@ -73,11 +429,38 @@ class VectorStore:
             embedding_model: OpenAI embedding model name (default: text-embedding-3-small)
             use_local_model: Use local SentenceTransformer instead of OpenAI (default: False, use OpenAI)
             local_model_name: Local model name for SentenceTransformer
+            embedding_batch_size: Maximum number of texts sent per embedding request
+            embedding_workers: Number of OpenAI embedding requests in flight at once
+            embedding_cache_path: Optional SQLite file caching embeddings by content
+                hash, so rebuilds only embed new or changed chunks and repeated
+                search queries are not re-embedded
+            dense_dtype: Storage dtype of the dense matrix, "float32" or "float16"
+                (half the memory and disk; scores are still computed in float32)
+            ann_int8: Store the ANN index's vectors as int8 (scalar quantized),
+                a quarter of the float32 size; only used by large stores
         """
+        if np.dtype(dense_dtype) not in (np.float32, np.float16):
+            raise ValueError(f"Unsupported dense_dtype: {dense_dtype!r}")
         self.entries: List[VectorStoreEntry] = []
-        self.bm25_index: Optional[BM25Okapi] = None
+        self.bm25_index: Optional[BM25Index] = None
+        self.vocab: Dict[str, int] = {}  # BM25 term -> token id
+        # (N, dim) matrix of L2-normalized dense vectors (dense_dtype), row i = entries[i]
+        self._dense_matrix: Optional[np.ndarray] = None
+        self.dense_dtype = np.dtype(dense_dtype).name
+        # Optional FAISS HNSW index over _dense_matrix (large stores only)
+        self.ann_index = None
+        self.ann_int8 = ann_int8
+        # Inverted metadata index: key -> value -> entry indices (list values expanded)
+        self._meta_index: Dict[str, Dict[Any, np.ndarray]] = {}
         self.embedding_model_name = embedding_model
+        self.local_model_name = local_model_name
         self.use_local_model = use_local_model
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_workers = embedding_workers
+        self.embedding_cache = EmbeddingCache(embedding_cache_path) if embedding_cache_path else None
+        # In-memory LRU of query embeddings, in front of the persistent cache
+        self._query_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
         
         # Initialize embedding model
         if use_local_model:
@@ -125,89 +508,220 @@ class VectorStore:
         """
         print(f"📥 Adding {len(chunks)} chunks to vector store...")
         
-        skipped = 0
-        for i, chunk in enumerate(chunks):
+        texts = [chunk.get("content", "") for chunk in chunks]
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        
+        # Reuse cached embeddings of unchanged chunks
+        cache_keys = []
+        if self.embedding_cache:
+            cache_keys = [EmbeddingCache.key(self._embedding_model_id, text) for text in texts]
+            cached = self.embedding_cache.get_many(cache_keys)
+            for i, key in enumerate(cache_keys):
+                vectors[i] = cached.get(key)
+            if cached:
+                hits = sum(vector is not None for vector in vectors)
+                print(f"   ♻️  Reusing {hits} cached embeddings")
+        
+        # Embed the rest in batches (one request per batch instead of per chunk).
+        # OpenAI batches are sent concurrently; results are matched back by batch.
+        to_embed = [i for i, vector in enumerate(vectors) if vector is None]
+        embed_texts = [texts[i] for i in to_embed]
+        batches = list(self._embedding_batches(embed_texts))
+        workers = 1 if self.use_local_model else max(1, self.embedding_workers)
+        
+        def embed(batch_range):
+            start, end = batch_range
             try:
-                entry = self._create_entry(chunk)
-                self.entries.append(entry)
-                if (i + 1) % 100 == 0:
-                    print(f"   Processed {i + 1}/{len(chunks)} chunks...")
-            except Exception as e:
+                return self._embed_batch_with_retry(embed_texts[start:end])
+            except Exception:
+                return None
+        
+        processed = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(embed, batch_range) for batch_range in batches]
+            # Build entries (tokenize for BM25) while the embedding requests are in flight
+            entries = [self._create_entry(chunk) for chunk in chunks]
+            results = [future.result() for future in futures]
+        
+        new_vectors = []
+        for (start, end), batch_vectors in zip(batches, results):
+            batch = to_embed[start:end]
+            if batch_vectors is None:
+                # Embed one by one so a single bad chunk only skips itself
+                batch_vectors = [self._try_generate_embedding(entries[i]) for i in batch]
+            
+            for i, vector in zip(batch, batch_vectors):
+                vectors[i] = vector
+                if vector is not None and self.embedding_cache:
+                    new_vectors.append((cache_keys[i], vector))
+            
+            previous, processed = processed, end
+            if processed // 100 > previous // 100:
+                print(f"   Processed {processed}/{len(embed_texts)} chunks...")
+        
+        if new_vectors:
+            self.embedding_cache.put_many(new_vectors)
+        
+        skipped = 0
+        for entry, vector in zip(entries, vectors):
+            if vector is None:
                 skipped += 1
-                chunk_id = chunk.get("chunk_id", "unknown")
-                print(f"   ⚠️  Skipping chunk {chunk_id[:50]}... (error: {str(e)[:50]})")
                 continue
+            entry.dense_vector = vector
+            self.entries.append(entry)
         
         if skipped > 0:
             print(f"   ⚠️  Skipped {skipped} chunks due to errors")
         
+        self._rebuild_dense_matrix()
+        self._rebuild_ann_index()
+        
         # Build BM25 index
-        if BM25_AVAILABLE:
-            print("🔍 Building BM25 sparse index...")
-            tokenized_corpus = [entry.tokens for entry in self.entries if entry.tokens]
-            if tokenized_corpus:
-                self.bm25_index = BM25Okapi(tokenized_corpus)
-        else:
-            print("⚠️  BM25 not available. Install with: pip install rank-bm25")
-            print("   Continuing with dense embeddings only...")
+        print("🔍 Building BM25 sparse index...")
+        self._rebuild_bm25_index()
+        self._rebuild_metadata_index()
         
         print(f"✅ Added {len(self.entries)} entries to vector store")
     
     def _create_entry(self, chunk: Dict[str, Any]) -> VectorStoreEntry:
-        """Create a vector store entry from a chunk."""
-        chunk_id = chunk.get("chunk_id", "")
+        """Create a vector store entry from a chunk (embedding is filled in later in batches)."""
         content = chunk.get("content", "")
-        metadata = chunk.get("metadata", {})
-        
-        # Generate dense embedding
-        dense_vector = self._generate_embedding(content)
-        
-        # Tokenize for BM25
-        tokens = self._tokenize(content)
-        
         return VectorStoreEntry(
-            chunk_id=chunk_id,
+            chunk_id=chunk.get("chunk_id", ""),
             content=content,
-            dense_vector=dense_vector,
-            metadata=metadata,
-            tokens=tokens
+            metadata=chunk.get("metadata", {}),
+            token_ids=self._token_ids(self._tokenize(content))  # Tokenize for BM25
         )
     
+    def _token_ids(self, tokens: List[str]) -> np.ndarray:
+        """Map tokens to int32 vocabulary ids, adding unseen terms to the vocabulary."""
+        vocab = self.vocab
+        return np.fromiter(
+            (vocab.setdefault(token, len(vocab)) for token in tokens),
+            dtype=np.int32,
+            count=len(tokens)
+        )
+    
+    def _try_generate_embedding(self, entry: VectorStoreEntry) -> Optional[np.ndarray]:
+        """Embed a single entry, returning None (and reporting it) if embedding fails."""
+        try:
+            return self._generate_embedding(entry.content)
+        except Exception as e:
+            print(f"   ⚠️  Skipping chunk {entry.chunk_id[:50]}... (error: {str(e)[:50]})")
+            return None
+    
+    def _embedding_batches(self, texts: List[str]):
+        """
+        Split texts into embedding request batches.
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            Iterator of (start, end) index ranges, each holding at most
+            embedding_batch_size texts and MAX_BATCH_CHARS characters
+        """
+        start = 0
+        batch_chars = 0
+        for i, text in enumerate(texts):
+            text_chars = min(len(text), MAX_EMBEDDING_CHARS)
+            if i > start and (i - start >= self.embedding_batch_size or batch_chars + text_chars > MAX_BATCH_CHARS):
+                yield start, i
+                start, batch_chars = i, 0
+            batch_chars += text_chars
+        if start < len(texts):
+            yield start, len(texts)
+    
+    def _embed_batch_with_retry(self, texts: List[str]) -> np.ndarray:
+        """Embed a batch, backing off and retrying when the API rate-limits us."""
+        if self.use_local_model:
+            return self._generate_embeddings_batch(texts)
+        
+        for attempt in range(EMBEDDING_MAX_RETRIES + 1):
+            # Small jitter so concurrent workers don't hit the API in lockstep
+            time.sleep(random.uniform(0, 0.05))
+            try:
+                return self._generate_embeddings_batch(texts)
+            except RateLimitError as e:
+                if attempt == EMBEDDING_MAX_RETRIES:
+                    raise
+                response = getattr(e, "response", None)
+                retry_after = response.headers.get("retry-after") if response is not None else None
+                try:
+                    delay = float(retry_after)
+                except (TypeError, ValueError):
+                    delay = 2 ** attempt
+                time.sleep(delay + random.uniform(0, 0.5))
+    
+    def _generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """Generate dense float32 embeddings for several texts with a single model call."""
+        texts = [_truncate_for_embedding(text) for text in texts]
+        
+        if self.use_local_model and self.embedding_model:
+            embeddings = self.embedding_model.encode(texts, batch_size=64, convert_to_numpy=True)
+            return np.asarray(embeddings, dtype=np.float32)
+        elif OPENAI_AVAILABLE:
+            response = self.embedding_model.embeddings.create(
+                model=self.embedding_model_name,
+                input=texts
+            )
+            # Results carry their input index; don't rely on response ordering
+            data = sorted(response.data, key=lambda item: item.index)
+            return np.array([item.embedding for item in data], dtype=np.float32)
+        else:
+            raise RuntimeError("No embedding model available")
+    
+    @property
+    def _embedding_model_id(self) -> str:
+        """Name of the model that actually produces this store's embeddings."""
+        return self.local_model_name if self.use_local_model else self.embedding_model_name
+    
+    def _query_embedding(self, query: str) -> np.ndarray:
+        """Embedding of a search query, from the in-memory or persistent cache when present."""
+        key = EmbeddingCache.key(self._embedding_model_id, query)
+        with self._query_embeddings_lock:
+            embedding = self._query_embeddings.get(key)
+            if embedding is not None:
+                self._query_embeddings.move_to_end(key)
+                return embedding
+        
+        embedding = None
+        if self.embedding_cache:
+            embedding = self.embedding_cache.get_many([key]).get(key)
+        if embedding is None:
+            embedding = self._generate_embedding(query)
+            if self.embedding_cache:
+                self.embedding_cache.put_many([(key, embedding)])
+        
+        with self._query_embeddings_lock:
+            self._query_embeddings[key] = embedding
+            if len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        return embedding
+    
     def _generate_embedding(self, text: str) -> np.ndarray:
-        """Generate dense embedding for text."""
-        # Truncate text if too long (OpenAI embeddings have 8K token limit)
-        # Rough estimate: 1 token ≈ 4 characters, so 8K tokens ≈ 32K chars
-        # Use 30K chars to be safe
-        MAX_CHARS = 30000
-        
-        if len(text) > MAX_CHARS:
-            text = text[:MAX_CHARS]
-            # Try to truncate at a sentence boundary if possible
-            last_period = text.rfind('.')
-            last_newline = text.rfind('\n')
-            truncate_at = max(last_period, last_newline)
-            if truncate_at > MAX_CHARS * 0.8:  # Only if we find a good break point
-                text = text[:truncate_at + 1]
+        """Generate dense float32 embedding for text."""
+        text = _truncate_for_embedding(text)
         
         if self.use_local_model and self.embedding_model:
             embedding = self.embedding_model.encode(text, convert_to_numpy=True)
-            return embedding
+            return np.asarray(embedding, dtype=np.float32)
         elif OPENAI_AVAILABLE:
             response = self.embedding_model.embeddings.create(
                 model=self.embedding_model_name,
                 input=text
             )
-            return np.array(response.data[0].embedding)
+            return np.array(response.data[0].embedding, dtype=np.float32)
         else:
             raise RuntimeError("No embedding model available")
     
     def _tokenize(self, text: str) -> List[str]:
         """Tokenize text for BM25."""
         # Simple tokenization (can be enhanced with proper NLP)
-        import re
         # Convert to lowercase and split on non-word characters
-        tokens = re.findall(r'\b\w+\b', text.lower())
-        return tokens
+        if text.isascii():
+            return text.translate(_ASCII_TOKEN_TABLE).split()
+        return _TOKEN_RE.findall(text.lower())
     
     def search(
         self,
@@ -216,7 +730,8 @@ class VectorStore:
         filter_metadata: Optional[Dict[str, Any]] = None,
         use_hybrid: bool = True,
         dense_weight: float = 0.7,
-        sparse_weight: float = 0.3
+        sparse_weight: float = 0.3,
+        prune: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Search the vector store.
@@ -228,94 +743,279 @@ class VectorStore:
             use_hybrid: Use hybrid search (dense + sparse)
             dense_weight: Weight for dense embeddings (0-1)
             sparse_weight: Weight for sparse vectors (0-1)
+            prune: "maxscore" to compute BM25 only for the top_k lexical matches
+                (via MaxScore pruning); other entries get a sparse score of 0
         
         Returns:
             List of search results with scores
         """
+        if prune not in (None, "maxscore"):
+            raise ValueError(f"Unknown prune strategy: {prune}")
+        
         # Filter entries by metadata
-        filtered_entries = self._filter_by_metadata(filter_metadata)
+        candidates = self._filter_by_metadata(filter_metadata)
         
-        if not filtered_entries:
+        if not len(candidates):
             return []
         
-        # Generate query embedding
-        query_embedding = self._generate_embedding(query)
-        query_tokens = self._tokenize(query)
+        # Query embedding (cached across searches for the same query)
+        query_embedding = self._query_embedding(query)
+        # Query terms unknown to the vocabulary can't match any document
+        query_ids = [self.vocab[t] for t in self._tokenize(query) if t in self.vocab]
         
-        # Calculate scores
-        scores = []
+        # Dense similarity (cosine) against every entry in one matrix-vector product
+        if self._dense_matrix is None:
+            self._rebuild_dense_matrix()
+        query_norm = np.linalg.norm(query_embedding)
+        query_unit = np.asarray(query_embedding, dtype=np.float32) / (query_norm if query_norm else 1.0)
+        ann_hits = self._ann_search(query_unit, top_k, candidates)
+        if ann_hits is not None:
+            # Only the ANN candidates are scored and ranked
+            candidates, ann_scores = ann_hits
+            dense_scores = np.zeros(len(self.entries), dtype=np.float32)
+            dense_scores[candidates] = ann_scores
+        else:
+            dense_scores = self._dense_scores(query_unit)
         
-        for entry in filtered_entries:
-            # Dense similarity (cosine similarity)
-            dense_score = self._cosine_similarity(query_embedding, entry.dense_vector)
-            
-            # Sparse score (BM25)
-            sparse_score = 0.0
-            if self.bm25_index and entry.tokens:
-                # Find entry index in original corpus
-                entry_idx = self.entries.index(entry)
-                if entry_idx < len(self.bm25_index.doc_freqs):
-                    sparse_score = self.bm25_index.get_scores(query_tokens)[entry_idx]
-                    # Normalize BM25 score (typically 0-20, normalize to 0-1)
-                    sparse_score = min(sparse_score / 20.0, 1.0)
-            
-            # Hybrid score
-            if use_hybrid:
-                hybrid_score = (dense_weight * dense_score) + (sparse_weight * sparse_score)
-            else:
-                hybrid_score = dense_score
-            
-            scores.append({
+        # Sparse scores (BM25) for the whole corpus, computed once per query.
+        # Normalize BM25 score (typically 0-20, normalize to 0-1)
+        sparse_scores = None
+        if self.bm25_index and prune == "maxscore":
+            corpus_size = self.bm25_index.corpus_size
+            allowed = np.zeros(corpus_size, dtype=bool)
+            allowed[candidates] = True
+            docs, bm25_scores = self.bm25_index.top_k(query_ids, top_k, candidates=allowed)
+            sparse_scores = np.zeros(corpus_size, dtype=np.float64)
+            sparse_scores[docs] = np.minimum(bm25_scores / 20.0, 1.0)
+        elif self.bm25_index:
+            sparse_scores = np.minimum(self.bm25_index.get_scores(query_ids) / 20.0, 1.0)
+        
+        # Hybrid scores for all candidates in one vectorized expression
+        dense = dense_scores[candidates].astype(np.float64)
+        sparse = sparse_scores[candidates] if sparse_scores is not None else np.zeros(len(candidates))
+        hybrid = dense_weight * dense + sparse_weight * sparse if use_hybrid else dense
+        
+        # Select the top_k without sorting every candidate (ties keep candidate order)
+        if 0 < top_k < len(candidates):
+            best = np.argpartition(-hybrid, top_k - 1)[:top_k]
+            best = best[np.lexsort((best, -hybrid[best]))]
+        else:
+            best = np.argsort(-hybrid, kind="stable")[:top_k]
+        
+        # Build result dicts only for the selected entries
+        results = []
+        for i in best:
+            entry = self.entries[candidates[i]]
+            results.append({
                 "chunk_id": entry.chunk_id,
                 "content": entry.content,
                 "metadata": entry.metadata,
-                "score": hybrid_score,
-                "dense_score": dense_score,
-                "sparse_score": sparse_score
+                "score": float(hybrid[i]),
+                "dense_score": float(dense[i]),
+                "sparse_score": float(sparse[i])
             })
+        return results
+    
+    def _dense_scores(self, query_unit: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of the query against every row of the dense matrix.
+        
+        A float16 matrix is scored in blocks upcast to float32, so the full
+        matrix is never materialized in float32.
+        
+        Args:
+            query_unit: L2-normalized float32 query embedding
+        
+        Returns:
+            float32 similarities, one per entry
+        """
+        matrix = self._dense_matrix
+        if matrix.dtype == np.float32:
+            return matrix @ query_unit
+        
+        scores = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), DENSE_SCORE_BLOCK_ROWS):
+            block = matrix[start:start + DENSE_SCORE_BLOCK_ROWS].astype(np.float32)
+            scores[start:start + len(block)] = block @ query_unit
+        return scores
+    
+    def _ann_search(
+        self,
+        query_unit: np.ndarray,
+        top_k: int,
+        candidates: np.ndarray
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Find dense candidates with the ANN index.
+        
+        Args:
+            query_unit: L2-normalized float32 query embedding
+            top_k: Number of results the search needs
+            candidates: Indices of the entries that pass the metadata filter
+        
+        Returns:
+            (ANN candidate entry indices, their cosine similarities), or None
+            when there is no ANN index or too few candidates pass the filter
+            (the caller then falls back to the exact scan)
+        """
+        if self.ann_index is None or top_k <= 0:
+            return None
         
-        # Sort by score and return top_k
-        scores.sort(key=lambda x: x["score"], reverse=True)
-        return scores[:top_k]
+        k = min(len(self.entries), top_k * ANN_OVERFETCH)
+        self.ann_index.hnsw.efSearch = max(64, k)
+        similarities, indices = self.ann_index.search(query_unit.reshape(1, -1), k)
+        
+        indices, similarities = indices[0], similarities[0]
+        keep = indices >= 0
+        if len(candidates) < len(self.entries):
+            allowed = np.zeros(len(self.entries), dtype=bool)
+            allowed[candidates] = True
+            keep &= allowed[np.maximum(indices, 0)]
+        
+        if keep.sum() < min(top_k, len(candidates)):
+            return None
+        return indices[keep], similarities[keep].astype(np.float32, copy=False)
     
-    def _filter_by_metadata(self, filters: Optional[Dict[str, Any]]) -> List[VectorStoreEntry]:
-        """Filter entries by metadata."""
+    def _filter_by_metadata(self, filters: Optional[Dict[str, Any]]) -> np.ndarray:
+        """
+        Filter entries by metadata.
+        
+        Args:
+            filters: Metadata key -> required value (for list-valued metadata such
+                as categories, the value must be one of the list's items)
+        
+        Returns:
+            Sorted array of matching indices into self.entries
+        """
         if not filters:
-            return self.entries
+            return np.arange(len(self.entries))
         
-        filtered = []
-        for entry in self.entries:
-            if not entry.metadata:
-                continue
+        mask = np.ones(len(self.entries), dtype=bool)
+        for key, value in filters.items():
+            try:
+                ids = None if value is None else self._meta_index.get(key, {}).get(value, _NO_TOKENS)
+            except TypeError:
+                ids = None  # Unhashable filter value
             
-            match = True
-            for key, value in filters.items():
-                entry_value = entry.metadata.get(key)
-                
-                # Handle list values (e.g., categories)
-                if isinstance(entry_value, list):
-                    if value not in entry_value:
-                        match = False
-                        break
-                elif entry_value != value:
-                    match = False
-                    break
+            if ids is None:
+                # Not answerable from the index (None matches a missing key): scan
+                key_mask = np.fromiter(
+                    (bool(entry.metadata) and _metadata_matches(entry.metadata.get(key), value)
+                     for entry in self.entries),
+                    dtype=bool,
+                    count=len(self.entries)
+                )
+            else:
+                key_mask = np.zeros(len(self.entries), dtype=bool)
+                key_mask[ids] = True
             
-            if match:
-                filtered.append(entry)
+            mask &= key_mask
+            if not mask.any():
+                break
+        
+        return np.flatnonzero(mask)
+    
+    def _rebuild_metadata_index(self):
+        """Build the inverted metadata index used by _filter_by_metadata."""
+        postings: Dict[str, Dict[Any, List[int]]] = {}
+        for entry_idx, entry in enumerate(self.entries):
+            for key, entry_value in (entry.metadata or {}).items():
+                key_postings = postings.setdefault(key, {})
+                # Handle list values (e.g., categories)
+                for value in (entry_value if isinstance(entry_value, list) else (entry_value,)):
+                    try:
+                        key_postings.setdefault(value, []).append(entry_idx)
+                    except TypeError:
+                        continue  # Unhashable values can't equal a hashable filter value
+        
+        self._meta_index = {
+            key: {value: np.asarray(ids, dtype=np.int32) for value, ids in key_postings.items()}
+            for key, key_postings in postings.items()
+        }
+    
+    def _rebuild_bm25_index(self):
+        """
+        Build the BM25 index over the entries' token ids.
+        
+        Every entry is a BM25 document (entries without tokens are empty ones), so
+        BM25 doc ids are the same as indices into self.entries.
+        """
+        tokenized_corpus = [
+            entry.token_ids if entry.token_ids is not None else _NO_TOKENS
+            for entry in self.entries
+        ]
+        has_tokens = any(len(ids) for ids in tokenized_corpus)
+        self.bm25_index = BM25Index(tokenized_corpus, len(self.vocab)) if has_tokens else None
+    
+    def _rebuild_ann_index(self):
+        """Build the FAISS HNSW index over the dense matrix (if faiss is installed and the store is large)."""
+        self.ann_index = None
+        if not FAISS_AVAILABLE or self._dense_matrix is None or len(self._dense_matrix) < ANN_MIN_ENTRIES:
+            return
         
-        return filtered
+        print("🧭 Building HNSW index for dense search...")
+        dim = self._dense_matrix.shape[1]
+        if self.ann_int8:
+            # int8 vector copy: a quarter of float32, trained on a sample of the rows
+            index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_8bit, ANN_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            step = max(1, len(self._dense_matrix) // ANN_TRAIN_ROWS)
+            index.train(np.ascontiguousarray(self._dense_matrix[::step], dtype=np.float32))
+        elif self._dense_matrix.dtype == np.float16:
+            # Keep the index's vector copy in float16 too
+            index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_fp16, ANN_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexHNSWFlat(dim, ANN_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = ANN_EF_CONSTRUCTION
+        # FAISS takes float32 input; add in blocks so a float16 matrix is never upcast whole
+        for start in range(0, len(self._dense_matrix), DENSE_SCORE_BLOCK_ROWS):
+            block = np.ascontiguousarray(
+                self._dense_matrix[start:start + DENSE_SCORE_BLOCK_ROWS], dtype=np.float32
+            )
+            if not index.is_trained:
+                index.train(block)
+            index.add(block)
+        self.ann_index = index
     
-    def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors."""
-        dot_product = np.dot(vec1, vec2)
-        norm1 = np.linalg.norm(vec1)
-        norm2 = np.linalg.norm(vec2)
+    def _rebuild_dense_matrix(self, vectors: Optional[np.ndarray] = None, normalized: bool = False):
+        """
+        Build the normalized dense matrix used by search.
+        
+        Rows are L2-normalized once here (in float32), so cosine similarity is a
+        plain dot product at query time, then stored as dense_dtype. Entries'
+        dense_vector fields become views of the matrix rows rather than separate
+        copies.
+        
+        Args:
+            vectors: Optional (N, dim) array aligned with self.entries (e.g. as
+                loaded from dense_vectors.npy); stacked from the entries if omitted
+            normalized: The given vectors are already unit length (used as-is,
+                converted to dense_dtype if needed)
+        """
+        if vectors is None:
+            dim = next(
+                (len(e.dense_vector) for e in self.entries if e.dense_vector is not None),
+                self.embedding_dim
+            )
+            vectors = np.zeros((len(self.entries), dim), dtype=np.float32)
+            for i, entry in enumerate(self.entries):
+                if entry.dense_vector is not None:
+                    vectors[i] = entry.dense_vector
         
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
+        dtype = np.dtype(self.dense_dtype)
+        matrix = np.ascontiguousarray(vectors, dtype=dtype if normalized else np.float32)
+        if not normalized:
+            # Never normalize the caller's array (or a read-only memmap) in place
+            if np.may_share_memory(matrix, vectors) or not matrix.flags.writeable:
+                matrix = matrix.copy()
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix /= norms
+            matrix = matrix.astype(dtype, copy=False)
+        self._dense_matrix = matrix
         
-        return dot_product / (norm1 * norm2)
+        for i, entry in enumerate(self.entries):
+            if entry.dense_vector is not None:
+                entry.dense_vector = matrix[i]
     
     def save(self, output_dir: str = "vector_store"):
         """Save vector store to disk."""
@@ -324,16 +1024,13 @@ class VectorStore:
         
         # Save entries (without numpy arrays for JSON)
         entries_data = []
-        dense_vectors = []
         
         for entry in self.entries:
             entries_data.append({
                 "chunk_id": entry.chunk_id,
                 "content": entry.content,
-                "metadata": entry.metadata,
-                "tokens": entry.tokens
+                "metadata": entry.metadata
             })
-            dense_vectors.append(entry.dense_vector)
         
         # Save metadata
         metadata_file = output_path / "metadata.json"
@@ -343,25 +1040,74 @@ class VectorStore:
                 "embedding_dim": self.embedding_dim,
                 "embedding_model": self.embedding_model_name,
                 "use_local_model": self.use_local_model,
+                "normalized": True,
+                "dense_dtype": self.dense_dtype,
+                "ann_int8": self.ann_int8,
                 "created_at": datetime.now().isoformat()
             }, f, indent=2)
         
-        # Save entries
-        entries_file = output_path / "entries.json"
-        with open(entries_file, 'w', encoding='utf-8') as f:
-            json.dump(entries_data, f, indent=2, ensure_ascii=False)
+        # Save entries: columnar Parquet when pyarrow is installed, NDJSON (one entry
+        # per line, streamed) otherwise. Other formats' files are removed so load()
+        # never picks up a stale copy.
+        if PYARROW_AVAILABLE:
+            entries_file = output_path / "entries.parquet"
+            # Metadata values vary in type between chunks, so keep them as JSON text
+            table = pa.table({
+                "chunk_id": [e["chunk_id"] for e in entries_data],
+                "content": [e["content"] for e in entries_data],
+                "metadata": [json.dumps(e["metadata"], ensure_ascii=False) for e in entries_data]
+            })
+            pq.write_table(table, entries_file, compression="zstd")
+        else:
+            entries_file = output_path / "entries.ndjson"
+            with open(entries_file, 'wb', buffering=1024 * 1024) as f:
+                for entry_data in entries_data:
+                    f.write(_json_line(entry_data))
+        for name in _ENTRY_FILES:
+            if name != entries_file.name:
+                (output_path / name).unlink(missing_ok=True)
+        
+        # Save the BM25 vocabulary (terms in id order) and per-entry token ids as one
+        # flat int32 array plus offsets
+        with open(output_path / "vocab.json", 'w', encoding='utf-8') as f:
+            json.dump(sorted(self.vocab, key=self.vocab.get), f, ensure_ascii=False)
+        token_arrays = [
+            entry.token_ids if entry.token_ids is not None else _NO_TOKENS
+            for entry in self.entries
+        ]
+        offsets = np.zeros(len(token_arrays) + 1, dtype=np.int64)
+        np.cumsum([len(ids) for ids in token_arrays], out=offsets[1:])
+        np.savez(
+            output_path / "token_ids.npz",
+            ids=np.concatenate(token_arrays) if token_arrays else np.zeros(0, dtype=np.int32),
+            offsets=offsets
+        )
         
-        # Save dense vectors as numpy array
+        # Save the BM25 index arrays so load() doesn't re-index the corpus
+        bm25_file = output_path / "bm25.npz"
+        if self.bm25_index is not None:
+            self.bm25_index.save(bm25_file)
+        else:
+            bm25_file.unlink(missing_ok=True)
+        
+        # Save dense vectors: the normalized (N, dim) search matrix, as is (dense_dtype).
+        # Written to a temp file and swapped in, so a store that was loaded
+        # memory-mapped from this directory isn't truncated under its mapping.
         vectors_file = output_path / "dense_vectors.npy"
-        if dense_vectors:
-            vectors_array = np.array(dense_vectors)
-            np.save(vectors_file, vectors_array)
+        if self.entries:
+            if self._dense_matrix is None:
+                self._rebuild_dense_matrix()
+            tmp_file = output_path / "dense_vectors.npy.tmp"
+            with open(tmp_file, 'wb') as f:
+                np.save(f, self._dense_matrix)
+            os.replace(tmp_file, vectors_file)
         
-        # Save BM25 index
-        if self.bm25_index:
-            bm25_file = output_path / "bm25_index.pkl"
-            with open(bm25_file, 'wb') as f:
-                pickle.dump(self.bm25_index, f)
+        # Save the ANN index so load() doesn't have to rebuild it
+        ann_file = output_path / "faiss.index"
+        if self.ann_index is not None:
+            faiss.write_index(self.ann_index, str(ann_file))
+        else:
+            ann_file.unlink(missing_ok=True)
         
         print(f"💾 Vector store saved to: {output_path}")
     
@@ -377,14 +1123,45 @@ class VectorStore:
         with open(metadata_file, 'r', encoding='utf-8') as f:
             metadata = json.load(f)
         
-        # Load entries
-        entries_file = input_path / "entries.json"
-        with open(entries_file, 'r', encoding='utf-8') as f:
-            entries_data = json.load(f)
+        # Load entries (Parquet, else NDJSON, else a legacy entries.json)
+        parquet_file = input_path / "entries.parquet"
+        ndjson_file = input_path / "entries.ndjson"
+        if parquet_file.exists():
+            if not PYARROW_AVAILABLE:
+                raise ImportError(
+                    "This vector store was saved as Parquet. Install: pip install pyarrow"
+                )
+            entries_data = pq.read_table(parquet_file).to_pylist()
+            for entry_data in entries_data:
+                entry_data["metadata"] = json.loads(entry_data["metadata"]) if entry_data["metadata"] else {}
+        elif ndjson_file.exists():
+            with open(ndjson_file, 'rb') as f:
+                entries_data = [_parse_json(line) for line in f if line.strip()]
+        else:
+            entries_file = input_path / "entries.json"
+            with open(entries_file, 'rb') as f:
+                entries_data = _parse_json(f.read())
         
-        # Load dense vectors
+        # Load dense vectors memory-mapped; entry vectors page in on demand
         vectors_file = input_path / "dense_vectors.npy"
-        dense_vectors = np.load(vectors_file) if vectors_file.exists() else []
+        dense_vectors = np.load(vectors_file, mmap_mode='r') if vectors_file.exists() else []
+        if len(dense_vectors) and dense_vectors.dtype in (np.float32, np.float16):
+            # Keep the saved precision, so the matrix is searched from the memory map
+            self.dense_dtype = dense_vectors.dtype.name
+        # Rebuild a stale ANN index with the quantization it was saved with
+        self.ann_int8 = metadata.get("ann_int8", self.ann_int8)
+        
+        # Load BM25 token ids (stores saved before vocab.json carry token lists in entries.json)
+        vocab_file = input_path / "vocab.json"
+        token_ids_file = input_path / "token_ids.npz"
+        token_ids = None
+        self.vocab = {}
+        if vocab_file.exists() and token_ids_file.exists():
+            with open(vocab_file, 'r', encoding='utf-8') as f:
+                self.vocab = {term: i for i, term in enumerate(json.load(f))}
+            with np.load(token_ids_file) as data:
+                ids, offsets = data["ids"].astype(np.int32, copy=False), data["offsets"]
+            token_ids = [ids[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
         
         # Reconstruct entries
         self.entries = []
@@ -394,15 +1171,44 @@ class VectorStore:
                 content=entry_data["content"],
                 dense_vector=dense_vectors[i] if len(dense_vectors) > i else None,
                 metadata=entry_data.get("metadata", {}),
-                tokens=entry_data.get("tokens", [])
+                token_ids=(
+                    token_ids[i] if token_ids is not None and i < len(token_ids)
+                    else self._token_ids(entry_data.get("tokens", []))
+                )
             )
             self.entries.append(entry)
         
-        # Load BM25 index
-        bm25_file = input_path / "bm25_index.pkl"
-        if bm25_file.exists():
-            with open(bm25_file, 'rb') as f:
-                self.bm25_index = pickle.load(f)
+        # Build the search matrix straight from the saved array when it covers every
+        # entry; stores saved normalized are searched directly from the memory map
+        if len(dense_vectors) == len(self.entries) and len(dense_vectors) > 0:
+            self._rebuild_dense_matrix(dense_vectors, normalized=metadata.get("normalized", False))
+        else:
+            self._rebuild_dense_matrix()
+        
+        # Load the saved ANN index if it still matches the entries, else rebuild it
+        ann_file = input_path / "faiss.index"
+        self.ann_index = None
+        if FAISS_AVAILABLE and ann_file.exists():
+            ann_index = faiss.read_index(str(ann_file))
+            if ann_index.ntotal == len(self.entries):
+                self.ann_index = ann_index
+        if self.ann_index is None:
+            self._rebuild_ann_index()
+        
+        # Load the saved BM25 index if it matches the entries and vocabulary, else
+        # rebuild it from the saved token ids (cheap compared to embedding)
+        bm25_file = input_path / "bm25.npz"
+        self.bm25_index = None
+        if bm25_file.exists() and token_ids is not None:
+            try:
+                bm25_index = BM25Index.load(bm25_file)
+            except KeyError:
+                bm25_index = None  # Saved in an older layout
+            if bm25_index is not None and bm25_index.corpus_size == len(self.entries) and len(bm25_index.idf) == len(self.vocab):
+                self.bm25_index = bm25_index
+        if self.bm25_index is None:
+            self._rebuild_bm25_index()
+        self._rebuild_metadata_index()
         
         print(f"📂 Vector store loaded from: {input_path}")
         print(f"   Entries: {len(self.entries)}")
@@ -416,18 +1222,12 @@ class VectorStore:
             "has_bm25": self.bm25_index is not None
         }
         
-        # Metadata distribution
-        metadata_dist = {}
-        for entry in self.entries:
-            if entry.metadata:
-                for key, value in entry.metadata.items():
-                    if key not in metadata_dist:
-                        metadata_dist[key] = {}
-                    if isinstance(value, list):
-                        for v in value:
-                            metadata_dist[key][v] = metadata_dist[key].get(v, 0) + 1
-                    else:
-                        metadata_dist[key][value] = metadata_dist[key].get(value, 0) + 1
+        # Metadata distribution, read off the inverted metadata index: the number of
+        # postings per value is its count (list values counted per item)
+        metadata_dist = {
+            key: {value: len(ids) for value, ids in postings.items()}
+            for key, postings in self._meta_index.items()
+        }
         
         stats["metadata_distribution"] = metadata_dist
         
@@ -3,6 +3,9 @@
 Build vector store from chunks.
 
 Creates dense embeddings and sparse BM25 index for hybrid retrieval.
+
+Usage: python build_vector_store.py [--int8]
+  --int8  Quantize the ANN index (built for large stores) to int8
 """
 
 import sys
@@ -32,7 +35,11 @@ def main():
         from backend.vector_store import VectorStore
         import json
         
-        store = VectorStore(use_local_model=False, embedding_model="text-embedding-3-small")
+        store = VectorStore(
+            use_local_model=False,
+            embedding_model="text-embedding-3-small",
+            ann_int8="--int8" in sys.argv[1:]
+        )
         
         # Load all chunks
         all_chunks = []
@@ -9,8 +9,26 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 load_dotenv()
 
+# Embedding requests: texts per request and requests in flight at once
+# (VectorStore retries rate-limited batches with exponential backoff)
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "100"))
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "10"))
+
+# Embeddings are cached by content hash, so rebuilds only embed new or changed chunks
+EMBEDDING_CACHE = os.getenv("EMBEDDING_CACHE", "embedding_cache.db")
+
+# Dense vectors are stored in float16: half the memory and disk of float32, with
+# no measurable effect on cosine-similarity ranking at 1536 dimensions
+VECTOR_DTYPE = os.getenv("VECTOR_DTYPE", "float16")
+
 # Check for OpenAI API key
 if not os.getenv("OPENAI_API_KEY") and not os.getenv("OPENROUTER_API_KEY"):
     print("⚠️  No OpenAI API key found!")
@@ -45,17 +63,28 @@ def main():
         
         # Initialize with OpenAI (not local model)
         print("📦 Initializing VectorStore with OpenAI embeddings...")
-        store = VectorStore(use_local_model=False, embedding_model="text-embedding-3-small")
+        store = VectorStore(
+            use_local_model=False,
+            embedding_model="text-embedding-3-small",
+            embedding_batch_size=EMBEDDING_BATCH_SIZE,
+            embedding_workers=EMBEDDING_CONCURRENCY,
+            embedding_cache_path=EMBEDDING_CACHE,
+            dense_dtype=VECTOR_DTYPE
+        )
         
         # Load all chunks
         all_chunks = []
         for chunk_file in chunk_files:
-            with open(chunk_file, 'r', encoding='utf-8') as f:
-                chunks_data = json.load(f)
-                all_chunks.extend(chunks_data.get("chunks", []))
+            if ORJSON_AVAILABLE:
+                chunks_data = orjson.loads(chunk_file.read_bytes())
+            else:
+                with open(chunk_file, 'r', encoding='utf-8') as f:
+                    chunks_data = json.load(f)
+            all_chunks.extend(chunks_data.get("chunks", []))
         
         print(f"📥 Adding {len(all_chunks)} chunks to vector store...")
-        print(f"   (This may take a few minutes - generating embeddings via API)")
+        print(f"   (Embedding via API: {EMBEDDING_BATCH_SIZE} chunks per request, "
+              f"{EMBEDDING_CONCURRENCY} requests in parallel)")
         store.add_chunks(all_chunks)
         
         # Save vector store
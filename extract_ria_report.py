@@ -6,116 +6,203 @@ Extract RIA report from JSON result and save as text file.
 import json
 from pathlib import Path
 
-def extract_report(json_file: str = "test_langgraph_result.json", output_file: str = "ria_report.txt"):
-    """Extract RIA report from JSON and save as text."""
-    
-    # Load the result file
-    with open(json_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    report_text = []
-    report_text.append('=' * 80)
-    report_text.append('BELGIAN REGULATORY IMPACT ASSESSMENT (RIA) REPORT')
-    report_text.append('Generated using EU-style detailed analysis')
-    report_text.append('=' * 80)
-    report_text.append('')
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# The only parts of the result file the report uses (ijson prefixes). Everything
+# else, e.g. the retrieved context, is skipped while streaming.
+REPORT_FIELDS = (
+    'proposal',
+    'final_report.metadata',
+    'final_report.sections',
+    'final_report.sources',
+)
+
+
+def _stream_report_fields(f) -> dict:
+    """
+    Read just the report fields from a LangGraph result file in one streaming pass.
     
-    # Proposal
-    proposal = data.get('proposal', '')
-    if proposal:
-        report_text.append('PROPOSAL:')
-        report_text.append('-' * 80)
-        report_text.append(proposal)
-        report_text.append('')
-        report_text.append('')
+    Args:
+        f: Result file opened in binary mode
     
-    # Metadata
-    metadata = data.get('final_report', {}).get('metadata', {})
-    if metadata:
-        report_text.append('METADATA:')
-        report_text.append('-' * 80)
-        report_text.append(f'  Generated at: {metadata.get("generated_at", "Unknown")}')
-        report_text.append(f'  Model: {metadata.get("model", "Unknown")}')
-        report_text.append(f'  Retrieval Strategy: {metadata.get("retrieval_strategy", "Unknown")}')
-        report_text.append(f'  Chunks Used: {metadata.get("chunks_used", 0)}')
-        report_text.append('')
-        report_text.append('')
+    Returns:
+        Dict shaped like the result file, holding only REPORT_FIELDS
+    """
+    found = {}
+    builder = None
+    current = None
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == current and event in ('end_map', 'end_array'):
+                found[current] = builder.value
+                builder = None
+        elif prefix in REPORT_FIELDS:
+            if event in ('start_map', 'start_array'):
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                current = prefix
+            elif event != 'map_key':
+                found[prefix] = value
     
-    # Final report
-    final_report = data.get('final_report', {})
+    data = {}
+    if 'proposal' in found:
+        data['proposal'] = found['proposal']
+    final_report = {
+        key.split('.', 1)[1]: value for key, value in found.items() if key.startswith('final_report.')
+    }
+    if final_report:
+        data['final_report'] = final_report
+    return data
+
+
+def extract_report(json_file: str = "test_langgraph_result.json", output_file: str = "ria_report.txt"):
+    """Extract RIA report from JSON and save as text."""
     
-    # Note: We only show structured sections, not the full raw content
-    # The structured sections contain the organized assessment
+    # Load the result file (streamed with ijson when available, keeping only the
+    # fields the report needs; otherwise parsed in one go, with orjson if installed)
+    if IJSON_AVAILABLE:
+        with open(json_file, 'rb') as f:
+            data = _stream_report_fields(f)
+    elif ORJSON_AVAILABLE:
+        data = orjson.loads(Path(json_file).read_bytes())
+    else:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
     
-    # Sections
-    sections = final_report.get('sections', {})
-    if sections:
-        report_text.append('=' * 80)
-        report_text.append('STRUCTURED SECTIONS')
-        report_text.append('=' * 80)
-        report_text.append('')
+    # Stream the report to the output file line by line (no in-memory list + join)
+    output_path = Path(output_file)
+    with open(output_path, 'w', encoding='utf-8', buffering=65536) as f:
+        separator = ''
         
-        # Separate sections by priority
-        background_section = sections.get('Background and Problem Definition', '')
-        impact_themes_section = sections.get('21 Belgian Impact Themes Assessment', '') or sections.get('21 Impact Themes Assessment', '')
-        other_sections = {k: v for k, v in sections.items() if k not in ['Background and Problem Definition', '21 Belgian Impact Themes Assessment', '21 Impact Themes Assessment']}
+        def add(line: str = '') -> None:
+            """Write one report line (lines are newline-separated, no trailing newline)."""
+            nonlocal separator
+            f.write(separator)
+            f.write(line)
+            separator = '\n'
         
-        # Print Background/Problem Definition FIRST (most important)
-        if background_section:
-            report_text.append('=' * 80)
-            report_text.append('BACKGROUND AND PROBLEM DEFINITION')
-            report_text.append('=' * 80)
-            report_text.append('')
-            report_text.append(background_section)
-            report_text.append('')
-            report_text.append('')
+        add('=' * 80)
+        add('BELGIAN REGULATORY IMPACT ASSESSMENT (RIA) REPORT')
+        add('Generated using EU-style detailed analysis')
+        add('=' * 80)
+        add()
         
-        # Print other sections (Executive Summary, Proposal Overview, etc.)
-        for section_name, section_content in other_sections.items():
-            if section_content:
-                report_text.append(section_name.upper())
-                report_text.append('-' * 80)
-                report_text.append(section_content)
-                report_text.append('')
-                report_text.append('')
+        # Proposal
+        proposal = data.get('proposal', '')
+        if proposal:
+            add('PROPOSAL:')
+            add('-' * 80)
+            add(proposal)
+            add()
+            add()
         
-        # Print 21 Belgian Impact Themes Assessment prominently
-        if impact_themes_section:
-            report_text.append('=' * 80)
-            report_text.append('21 BELGIAN IMPACT THEMES ASSESSMENT')
-            report_text.append('(Standard Belgian RIA Structure with EU-style Analysis)')
-            report_text.append('=' * 80)
-            report_text.append('')
-            report_text.append(impact_themes_section)
-            report_text.append('')
-            report_text.append('')
-    
-    # Note: Retrieved context is used internally to inform the assessment but not shown in final report
-    # Citations in the assessment content should reference the documents that were used
-    
-    # Sources
-    sources = final_report.get('sources', [])
-    if sources:
-        report_text.append('=' * 80)
-        report_text.append('SOURCES')
-        report_text.append('=' * 80)
-        report_text.append('')
-        for i, source in enumerate(sources, 1):
-            report_text.append(f'{i}. {source.get("document", "Unknown")}')
-            report_text.append(f'   Jurisdiction: {source.get("jurisdiction", "Unknown")}')
-            report_text.append(f'   Category: {source.get("category", "Unknown")}')
-            report_text.append(f'   Year: {source.get("year", "Unknown")}')
-            report_text.append('')
-    
-    # Write to file
-    output_path = Path(output_file)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(report_text))
+        # Metadata
+        metadata = data.get('final_report', {}).get('metadata', {})
+        if metadata:
+            add('METADATA:')
+            add('-' * 80)
+            add(f'  Generated at: {metadata.get("generated_at", "Unknown")}')
+            add(f'  Model: {metadata.get("model", "Unknown")}')
+            add(f'  Retrieval Strategy: {metadata.get("retrieval_strategy", "Unknown")}')
+            add(f'  Chunks Used: {metadata.get("chunks_used", 0)}')
+            add()
+            add()
+        
+        # Final report
+        final_report = data.get('final_report', {})
+        
+        # Note: We only show structured sections, not the full raw content
+        # The structured sections contain the organized assessment
+        
+        # Sections
+        sections = final_report.get('sections', {})
+        filled_sections = 0
+        if sections:
+            add('=' * 80)
+            add('STRUCTURED SECTIONS')
+            add('=' * 80)
+            add()
+        
+            # Separate sections by priority (one pass, also counting non-empty sections)
+            background_section = ''
+            belgian_themes_section = ''
+            impact_themes_section = ''
+            other_sections = []
+            for section_name, section_content in sections.items():
+                if section_content:
+                    filled_sections += 1
+                if section_name == 'Background and Problem Definition':
+                    background_section = section_content
+                elif section_name == '21 Belgian Impact Themes Assessment':
+                    belgian_themes_section = section_content
+                elif section_name == '21 Impact Themes Assessment':
+                    impact_themes_section = section_content
+                else:
+                    other_sections.append((section_name, section_content))
+            impact_themes_section = belgian_themes_section or impact_themes_section
+        
+            # Print Background/Problem Definition FIRST (most important)
+            if background_section:
+                add('=' * 80)
+                add('BACKGROUND AND PROBLEM DEFINITION')
+                add('=' * 80)
+                add()
+                add(background_section)
+                add()
+                add()
+        
+            # Print other sections (Executive Summary, Proposal Overview, etc.)
+            for section_name, section_content in other_sections:
+                if section_content:
+                    add(section_name.upper())
+                    add('-' * 80)
+                    add(section_content)
+                    add()
+                    add()
+        
+            # Print 21 Belgian Impact Themes Assessment prominently
+            if impact_themes_section:
+                add('=' * 80)
+                add('21 BELGIAN IMPACT THEMES ASSESSMENT')
+                add('(Standard Belgian RIA Structure with EU-style Analysis)')
+                add('=' * 80)
+                add()
+                add(impact_themes_section)
+                add()
+                add()
+        
+        # Note: Retrieved context is used internally to inform the assessment but not shown in final report
+        # Citations in the assessment content should reference the documents that were used
+        
+        # Sources
+        sources = final_report.get('sources', [])
+        if sources:
+            add('=' * 80)
+            add('SOURCES')
+            add('=' * 80)
+            add()
+            for i, source in enumerate(sources, 1):
+                add(f'{i}. {source.get("document", "Unknown")}')
+                add(f'   Jurisdiction: {source.get("jurisdiction", "Unknown")}')
+                add(f'   Category: {source.get("category", "Unknown")}')
+                add(f'   Year: {source.get("year", "Unknown")}')
+                add()
     
     file_size = output_path.stat().st_size
     print(f'✅ RIA Report saved to: {output_file}')
     print(f'   File size: {file_size:,} bytes')
-    print(f'   Sections: {len([s for s in sections.values() if s])}/{len(sections)}')
+    print(f'   Sections: {filled_sections}/{len(sections)}')
     print(f'   Sources: {len(sources)}')
 
 if __name__ == "__main__":
@@ -2,79 +2,264 @@
 pdf_reader.py
 
 Extracts text from PDFs that contain selectable text and also runs OCR on
-embedded images, keeping per-page structure for references.
+embedded images, keeping per-page structure for references. Images are only
+OCR'd on pages with little selectable text (scanned pages); born-digital pages
+are taken from their text layer.
 
 Dependencies:
   - pymupdf (install as: pip install pymupdf)
   - pytesseract (pip install pytesseract) and the Tesseract binary installed on the system
   - Pillow (pip install Pillow)
+  - tesserocr (optional, pip install tesserocr): keeps one Tesseract engine loaded
+    per worker instead of starting a Tesseract process for every image
+  - paddleocr (optional, pip install paddleocr paddlepaddle-gpu): GPU OCR backend,
+    used when OCR_BACKEND=paddle (also needs numpy, which paddleocr installs)
 
 Usage (example):
   python pdf_reader.py input.pdf output.txt
+
+Pages are processed in parallel worker processes; set OCR_CONCURRENCY to choose
+how many (default: one per 4 CPUs, as Tesseract itself uses up to 4 threads).
+Set OCR_BACKEND=paddle to OCR with PaddleOCR on the GPU instead of Tesseract
+(each worker loads its own model, so keep OCR_CONCURRENCY low on a single GPU).
 """
 
+import atexit
+import os
 import sys
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from importlib.util import find_spec
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
 
 import fitz  # PyMuPDF
 import pytesseract
 from PIL import Image
 import io
 
+try:
+    from tesserocr import PyTessBaseAPI
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+# Located only: paddleocr (and paddle) are imported by the workers that use it
+PADDLEOCR_AVAILABLE = find_spec("paddleocr") is not None
+
+# OCR engine: "tesseract" (default) or "paddle" (PaddleOCR, GPU)
+OCR_BACKEND = os.getenv("OCR_BACKEND", "tesseract").lower()
+
+# Page worker processes. Tesseract runs up to 4 threads per OCR call, so more
+# than one worker per 4 cores only oversubscribes the CPU.
+OCR_CONCURRENCY = int(os.getenv("OCR_CONCURRENCY", max(1, (os.cpu_count() or 1) // 4)))
+
+# Pages with at least this much selectable text are treated as born-digital and
+# their images are not OCR'd (OCR is orders of magnitude slower than text extraction)
+MIN_TEXT_CHARS_TO_SKIP_OCR = 200
+
+# Embedded image formats Tesseract (Leptonica) decodes itself; these are handed
+# over as files instead of being decoded by PIL and re-encoded for Tesseract
+TESSERACT_NATIVE_FORMATS = {"png", "jpeg", "jpg", "tiff", "tif", "bmp", "pnm", "gif", "webp"}
+
+# Images are OCR'd at no more than this resolution (at their size on the page) and
+# in 8-bit grayscale; Tesseract converts to grayscale itself and its run time
+# grows with pixel count, so larger colour scans only cost time
+OCR_TARGET_DPI = 300
+
+# An embedded image: raw encoded bytes, or a PIL image already prepared for OCR
+OcrImage = Union[bytes, Image.Image]
+
+# Output file buffer: pages are written as they finish rather than joined at the end
+OUTPUT_BUFFER_SIZE = 64 * 1024
+
+# The PDF opened by the current worker process (fitz.Document can't be pickled,
+# so each worker opens the file once in its initializer)
+_worker_doc = None
+# The current worker's Tesseract engine (tesserocr only); the LSTM model is
+# loaded once per worker rather than once per image
+_worker_ocr_api = None
+# The current worker's PaddleOCR model (OCR_BACKEND=paddle only)
+_worker_paddle_ocr = None
+# OCR text already produced by this worker, by image xref. Logos and headers
+# repeated across pages share one xref, so they are OCR'd once per worker
+_worker_ocr_cache: Dict[int, str] = {}
 
-def extract_page_text(doc: fitz.Document, page_index: int) -> str:
-    """Extract selectable text from a page."""
-    page = doc.load_page(page_index)
+
+def extract_page_text(page: fitz.Page) -> str:
+    """Extract selectable text from a loaded page."""
     return page.get_text("text")
 
 
-def extract_images_simple(doc: fitz.Document, page_index: int) -> List[Tuple[str, Image.Image]]:
+def prepare_image_for_ocr(page: fitz.Page, xref: int, image_bytes: bytes) -> OcrImage:
     """
-    Simplified image extraction that opens the image bytes via PIL directly.
+    Convert an embedded image to grayscale and downscale it to OCR_TARGET_DPI at
+    its displayed size on the page. Images that are already grayscale and small
+    enough are returned as their raw bytes, undecoded.
+    
+    Args:
+        page: Page the image is drawn on
+        xref: Image xref
+        image_bytes: Encoded image bytes
+    
+    Returns:
+        The raw bytes, or the prepared PIL image
     """
-    page = doc.load_page(page_index)
-    out: List[Tuple[str, Image.Image]] = []
-    for img_index, img in enumerate(page.get_images(full=True)):
-        xref = img[0]
-        base = doc.extract_image(xref)
-        image_bytes = base["image"]
-        pil_img = Image.open(io.BytesIO(image_bytes))
-        label = f"page_{page_index + 1}_img_{img_index + 1}"
-        out.append((label, pil_img))
+    img = Image.open(io.BytesIO(image_bytes))  # reads the header only
+
+    # Largest placement of the image on the page, in pixels at the target DPI
+    rects = page.get_image_rects(xref)
+    max_size = None
+    if rects:
+        max_size = (
+            max(1, round(max(r.width for r in rects) / 72 * OCR_TARGET_DPI)),
+            max(1, round(max(r.height for r in rects) / 72 * OCR_TARGET_DPI)),
+        )
+    oversized = max_size is not None and (img.width > max_size[0] or img.height > max_size[1])
+
+    if img.mode in ("L", "1") and not oversized:
+        return image_bytes
+
+    img = img.convert("L")
+    if oversized:
+        img.thumbnail(max_size, Image.LANCZOS)
+    return img
+
+
+def extract_images_simple(page: fitz.Page) -> List[Tuple[str, int]]:
+    """
+    Simplified image listing for a loaded page: (label, xref) per image. The
+    image data itself is only extracted when it needs OCR (load_image_for_ocr).
+    """
+    out: List[Tuple[str, int]] = []
+    for img_index, img in enumerate(page.get_images(full=False)):
+        label = f"page_{page.number + 1}_img_{img_index + 1}"
+        out.append((label, img[0]))
     return out
 
 
-def ocr_images(images: List[Tuple[str, Image.Image]]) -> List[Tuple[str, str]]:
-    """Run OCR on a list of (label, PIL.Image) and return (label, text)."""
+def load_image_for_ocr(page: fitz.Page, xref: int) -> Tuple[OcrImage, str]:
+    """Extract an image from the PDF and prepare it for OCR; returns (image, ext)."""
+    base = page.parent.extract_image(xref)
+    return prepare_image_for_ocr(page, xref, base["image"]), base["ext"]
+
+
+def ocr_image(image: OcrImage, ext: str) -> str:
+    """
+    OCR one image. Raw bytes in a format Tesseract reads natively go to pytesseract
+    as a file, skipping PIL's decode and re-encode; otherwise PIL decodes them.
+    """
+    if isinstance(image, Image.Image):
+        img = image
+    elif _worker_paddle_ocr is None and _worker_ocr_api is None and ext.lower() in TESSERACT_NATIVE_FORMATS:
+        with tempfile.NamedTemporaryFile(suffix=f".{ext}", delete=False) as tmp:
+            tmp.write(image)
+        try:
+            return pytesseract.image_to_string(tmp.name)
+        finally:
+            os.remove(tmp.name)
+    else:
+        img = Image.open(io.BytesIO(image))
+
+    if _worker_paddle_ocr is not None:
+        import numpy as np  # installed with paddleocr
+        # PaddleOCR takes BGR arrays; returns one list of (box, (text, score)) per image
+        result = _worker_paddle_ocr.ocr(np.asarray(img.convert("RGB"))[:, :, ::-1], cls=False)
+        lines = result[0] or []
+        return "\n".join(text for _box, (text, _score) in lines)
+    if _worker_ocr_api is not None:
+        _worker_ocr_api.SetImage(img)
+        return _worker_ocr_api.GetUTF8Text()
+    return pytesseract.image_to_string(img)
+
+
+def ocr_images(page: fitz.Page, images: List[Tuple[str, int]]) -> List[Tuple[str, str]]:
+    """Run OCR on a page's (label, xref) images and return (label, text)."""
     results: List[Tuple[str, str]] = []
-    for label, img in images:
-        text = pytesseract.image_to_string(img)
+    for label, xref in images:
+        text = _worker_ocr_cache.get(xref)
+        if text is None:
+            text = ocr_image(*load_image_for_ocr(page, xref))
+            _worker_ocr_cache[xref] = text
         if text.strip():
             results.append((label, text))
     return results
 
 
-def process_pdf(input_path: Path, output_path: Path) -> None:
-    doc = fitz.open(input_path)
+def _use_paddle_ocr() -> bool:
+    """Whether PaddleOCR was requested via OCR_BACKEND and is installed."""
+    return OCR_BACKEND == "paddle" and PADDLEOCR_AVAILABLE
+
+
+def _init_worker(pdf_path: str) -> None:
+    """Open the PDF and the OCR engine (PaddleOCR, or tesserocr if installed) once per worker process."""
+    global _worker_doc, _worker_ocr_api, _worker_paddle_ocr
+    _worker_doc = fitz.open(pdf_path)
+    if _use_paddle_ocr():
+        from paddleocr import PaddleOCR
+        _worker_paddle_ocr = PaddleOCR(use_angle_cls=False, lang="en", use_gpu=True, show_log=False)
+    elif TESSEROCR_AVAILABLE:
+        _worker_ocr_api = PyTessBaseAPI(lang="eng")
+        atexit.register(_worker_ocr_api.End)
+
 
-    parts: List[str] = []
+def _process_page(page_index: int) -> Tuple[int, str, List[Tuple[str, str]]]:
+    """Extract a page's selectable text and OCR its images (runs in a worker process)."""
+    # Load the page once for both text and image extraction
+    page = _worker_doc.load_page(page_index)
+    page_text = extract_page_text(page).strip()
+    if len(page_text) >= MIN_TEXT_CHARS_TO_SKIP_OCR:
+        return page_index, page_text, []
+    ocr_results = ocr_images(page, extract_images_simple(page))
+    return page_index, page_text, ocr_results
 
-    for page_index in range(len(doc)):
+
+def _in_page_order(futures: List[Future]) -> Iterator[Tuple[int, str, List[Tuple[str, str]]]]:
+    """
+    Yield page results in page order as the futures complete. Pages that finish
+    ahead of a slow page are held in a buffer and released as soon as the gap closes.
+    """
+    buffer = {}
+    next_to_yield = 0
+    for future in as_completed(futures):
+        page = future.result()
+        buffer[page[0]] = page
+        while next_to_yield in buffer:
+            yield buffer.pop(next_to_yield)
+            next_to_yield += 1
+
+
+def _format_pages(pages: Iterable[Tuple[int, str, List[Tuple[str, str]]]]) -> Iterator[str]:
+    """Yield the output text blocks for processed pages, in the order given."""
+    for page_index, page_text, ocr_results in pages:
         page_number = page_index + 1
-        # Extract selectable text
-        page_text = extract_page_text(doc, page_index).strip()
-        parts.append(f"\n=== Page {page_number} (selectable text) ===\n{page_text}")
+        yield f"\n=== Page {page_number} (selectable text) ===\n{page_text}"
 
-        # Extract images and OCR them
-        images = extract_images_simple(doc, page_index)
-        ocr_results = ocr_images(images)
         if ocr_results:
-            parts.append(f"\n=== Page {page_number} (OCR from images) ===")
+            yield f"\n=== Page {page_number} (OCR from images) ==="
             for label, text in ocr_results:
-                parts.append(f"\n[{label}]\n{text.strip()}")
+                yield f"\n[{label}]\n{text.strip()}"
+
+
+def process_pdf(input_path: Path, output_path: Path) -> None:
+    with fitz.open(input_path) as doc:
+        page_count = len(doc)
+
+    if OCR_BACKEND == "paddle" and not PADDLEOCR_AVAILABLE:
+        print("OCR_BACKEND=paddle but paddleocr is not installed; using Tesseract")
 
-    output_path.write_text("\n".join(parts), encoding="utf-8")
+    with ProcessPoolExecutor(
+        max_workers=max(1, OCR_CONCURRENCY),
+        initializer=_init_worker,
+        initargs=(str(input_path),),
+    ) as executor, open(output_path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_SIZE) as f:
+        # One task per page; each page is written as soon as it and every page
+        # before it are done (blocks are newline-separated)
+        futures = [executor.submit(_process_page, page_index) for page_index in range(page_count)]
+        for block_index, block in enumerate(_format_pages(_in_page_order(futures))):
+            if block_index:
+                f.write("\n")
+            f.write(block)
 
 
 def main() -> None:
@@ -6,9 +6,33 @@ Example queries to demonstrate graph traversal and retrieval.
 """
 
 import sys
+from collections import defaultdict
 from pathlib import Path
 from backend.knowledge_graph import KnowledgeGraphBuilder
 
+def index_graph(graph):
+    """
+    Index the graph in one pass so the queries below don't rescan it.
+    
+    Args:
+        graph: Loaded knowledge graph
+    
+    Returns:
+        (nodes by node_type, successors by node and node_type), both keeping
+        the graph's node/edge order
+    """
+    node_types = dict(graph.nodes(data="node_type"))
+    nodes_by_type = defaultdict(list)
+    for node, node_type in node_types.items():
+        nodes_by_type[node_type].append(node)
+    
+    successors_by_type = defaultdict(lambda: defaultdict(list))
+    for node, neighbors in graph.adjacency():
+        for neighbor in neighbors:
+            successors_by_type[node][node_types[neighbor]].append(neighbor)
+    
+    return nodes_by_type, successors_by_type
+
 def main():
     """Run example queries on the knowledge graph."""
     graph_file = Path("knowledge_graph.pkl")
@@ -19,6 +43,7 @@ def main():
     
     builder = KnowledgeGraphBuilder()
     graph = builder.load_graph(str(graph_file))
+    nodes_by_type, successors_by_type = index_graph(graph)
     
     print("🔍 Knowledge Graph Query Examples")
     print("=" * 60)
@@ -26,34 +51,31 @@ def main():
     
     # Query 1: Get all categories
     print("1. All Policy Categories:")
-    categories = [node for node, data in graph.nodes(data=True) if data.get("node_type") == "category"]
+    categories = nodes_by_type["category"]
     for cat_node in sorted(categories):
         cat_name = graph.nodes[cat_node].get("name", "")
         # Count chunks in this category
-        chunk_count = sum(1 for neighbor in graph.successors(cat_node) 
-                         if graph.nodes[neighbor].get("node_type") == "chunk")
+        chunk_count = len(successors_by_type[cat_node]["chunk"])
         print(f"   - {cat_name}: {chunk_count} chunks")
     print()
     
     # Query 2: Get all domains
     print("2. All Domains:")
-    domains = [node for node, data in graph.nodes(data=True) if data.get("node_type") == "domain"]
+    domains = nodes_by_type["domain"]
     for domain_node in sorted(domains):
         domain_name = graph.nodes[domain_node].get("name", "")
         # Count connected categories
-        cat_count = sum(1 for neighbor in graph.successors(domain_node)
-                        if graph.nodes[neighbor].get("node_type") == "category")
+        cat_count = len(successors_by_type[domain_node]["category"])
         print(f"   - {domain_name}: connected to {cat_count} categories")
     print()
     
     # Query 3: Get analysis patterns
     print("3. Analysis Patterns:")
-    patterns = [node for node, data in graph.nodes(data=True) if data.get("node_type") == "analysis_pattern"]
+    patterns = nodes_by_type["analysis_pattern"]
     for pattern_node in sorted(patterns):
         pattern_name = graph.nodes[pattern_node].get("name", "")
         # Count chunks using this pattern
-        chunk_count = sum(1 for neighbor in graph.successors(pattern_node)
-                         if graph.nodes[neighbor].get("node_type") == "chunk")
+        chunk_count = len(successors_by_type[pattern_node]["chunk"])
         print(f"   - {pattern_name}: used by {chunk_count} chunks")
     print()
     
@@ -61,8 +83,7 @@ def main():
     print("4. Sample: Chunks in 'Environment' category:")
     env_node = "category:Environment"
     if env_node in graph:
-        env_chunks = [neighbor for neighbor in graph.successors(env_node)
-                     if graph.nodes[neighbor].get("node_type") == "chunk"]
+        env_chunks = successors_by_type[env_node]["chunk"]
         print(f"   Found {len(env_chunks)} chunks")
         for i, chunk_node in enumerate(env_chunks[:5], 1):
             chunk_data = graph.nodes[chunk_node]
@@ -73,11 +94,10 @@ def main():
     
     # Query 5: Document to chunks relationship
     print("5. Documents and their chunks:")
-    documents = [node for node, data in graph.nodes(data=True) if data.get("node_type") == "document"]
+    documents = nodes_by_type["document"]
     for doc_node in sorted(documents)[:3]:
         doc_name = graph.nodes[doc_node].get("name", "")
-        chunk_count = sum(1 for neighbor in graph.successors(doc_node)
-                         if graph.nodes[neighbor].get("node_type") == "chunk")
+        chunk_count = len(successors_by_type[doc_node]["chunk"])
         print(f"   - {doc_name}: {chunk_count} chunks")
     print()
     
@@ -86,13 +106,11 @@ def main():
     env_node = "category:Environment"
     if env_node in graph:
         # Get domains connected to Environment
-        domains = [neighbor for neighbor in graph.successors(env_node)
-                  if graph.nodes[neighbor].get("node_type") == "domain"]
+        domains = successors_by_type[env_node]["domain"]
         for domain_node in domains[:2]:
             domain_name = graph.nodes[domain_node].get("name", "")
             # Get patterns connected to this domain
-            patterns = [neighbor for neighbor in graph.successors(domain_node)
-                       if graph.nodes[neighbor].get("node_type") == "analysis_pattern"]
+            patterns = successors_by_type[domain_node]["analysis_pattern"]
             print(f"   {domain_name}: {len(patterns)} patterns")
             for pattern_node in patterns[:3]:
                 pattern_name = graph.nodes[pattern_node].get("name", "")
@@ -101,8 +119,8 @@ def main():
     
     # Query 7: Evidence supporting analysis
     print("7. Evidence -> Analysis relationships:")
-    evidence_chunks = [node for node, data in graph.nodes(data=True)
-                      if data.get("node_type") == "chunk" and data.get("chunk_type") == "evidence"]
+    evidence_chunks = [node for node in nodes_by_type["chunk"]
+                      if graph.nodes[node].get("chunk_type") == "evidence"]
     if evidence_chunks:
         sample_evidence = evidence_chunks[0]
         # Find analysis chunks this evidence supports
@@ -6,8 +6,30 @@ Demonstrates hybrid search with dense embeddings and sparse BM25.
 """
 
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from backend.vector_store import VectorStore
 
+# The example searches, run concurrently (each one embeds its query, which is a
+# network round trip with API embeddings); results are printed in this order
+EXAMPLE_QUERIES = [
+    # 1. Semantic search (dense only)
+    dict(query="environmental impact of nature restoration", top_k=5, use_hybrid=False),
+    # 2. Keyword search (BM25)
+    dict(query="biodiversity ecosystem restoration", top_k=5, use_hybrid=False,
+         dense_weight=0.0, sparse_weight=1.0),
+    # 3. Hybrid search
+    dict(query="administrative burdens for SMEs", top_k=5, use_hybrid=True,
+         dense_weight=0.7, sparse_weight=0.3),
+    # 4. Metadata filtering
+    dict(query="impact assessment", top_k=5,
+         filter_metadata={
+             "jurisdiction": "EU",
+             "categories": "Environment"  # Will check if "Environment" in categories list
+         }),
+    # 5. Filter by year
+    dict(query="policy options", top_k=5, filter_metadata={"year": "2022"}),
+]
+
 def main():
     """Run example queries on the vector store."""
     store = VectorStore(use_local_model=True)
@@ -18,6 +40,9 @@ def main():
         print("❌ Vector store not found. Run build_vector_store.py first.")
         sys.exit(1)
     
+    with ThreadPoolExecutor(max_workers=len(EXAMPLE_QUERIES)) as executor:
+        all_results = list(executor.map(lambda kwargs: store.search(**kwargs), EXAMPLE_QUERIES))
+    
     print("🔍 Vector Store Query Examples")
     print("=" * 60)
     print()
@@ -25,11 +50,7 @@ def main():
     # Query 1: Semantic search
     print("1. Semantic Search (Dense Embeddings):")
     print("   Query: 'environmental impact of nature restoration'")
-    results = store.search(
-        "environmental impact of nature restoration",
-        top_k=5,
-        use_hybrid=False  # Dense only
-    )
+    results = all_results[0]
     for i, result in enumerate(results, 1):
         print(f"   {i}. Score: {result['score']:.4f}")
         print(f"      Chunk: {result['chunk_id'][:60]}...")
@@ -39,13 +60,7 @@ def main():
     # Query 2: Keyword search (BM25)
     print("2. Keyword Search (BM25 Sparse Vectors):")
     print("   Query: 'biodiversity ecosystem restoration'")
-    results = store.search(
-        "biodiversity ecosystem restoration",
-        top_k=5,
-        use_hybrid=False,
-        dense_weight=0.0,
-        sparse_weight=1.0
-    )
+    results = all_results[1]
     for i, result in enumerate(results, 1):
         print(f"   {i}. Score: {result['score']:.4f} (sparse: {result['sparse_score']:.4f})")
         print(f"      Chunk: {result['chunk_id'][:60]}...")
@@ -54,13 +69,7 @@ def main():
     # Query 3: Hybrid search
     print("3. Hybrid Search (Dense + Sparse):")
     print("   Query: 'administrative burdens for SMEs'")
-    results = store.search(
-        "administrative burdens for SMEs",
-        top_k=5,
-        use_hybrid=True,
-        dense_weight=0.7,
-        sparse_weight=0.3
-    )
+    results = all_results[2]
     for i, result in enumerate(results, 1):
         print(f"   {i}. Score: {result['score']:.4f} (dense: {result['dense_score']:.4f}, sparse: {result['sparse_score']:.4f})")
         print(f"      Chunk: {result['chunk_id'][:60]}...")
@@ -70,14 +79,7 @@ def main():
     print("4. Metadata Filtering:")
     print("   Query: 'impact assessment'")
     print("   Filter: jurisdiction=EU, category=Environment")
-    results = store.search(
-        "impact assessment",
-        top_k=5,
-        filter_metadata={
-            "jurisdiction": "EU",
-            "categories": "Environment"  # Will check if "Environment" in categories list
-        }
-    )
+    results = all_results[3]
     for i, result in enumerate(results, 1):
         print(f"   {i}. Score: {result['score']:.4f}")
         print(f"      Jurisdiction: {result['metadata'].get('jurisdiction', 'N/A')}")
@@ -89,11 +91,7 @@ def main():
     print("5. Filter by Year:")
     print("   Query: 'policy options'")
     print("   Filter: year=2022")
-    results = store.search(
-        "policy options",
-        top_k=5,
-        filter_metadata={"year": "2022"}
-    )
+    results = all_results[4]
     for i, result in enumerate(results, 1):
         print(f"   {i}. Score: {result['score']:.4f}")
         print(f"      Year: {result['metadata'].get('year', 'N/A')}")
@@ -1,17 +1,61 @@
 #!/usr/bin/env python3
 """Extract text from Word document and analyze structure."""
 
-from docx import Document
 import sys
+import zipfile
+
+try:
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+W_NS = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+
+# Body paragraphs (what python-docx's doc.paragraphs returns) and the run
+# content their text is built from, in document order. Only line breaks count:
+# python-docx gives page and column breaks no text, so they are not matched
+if LXML_AVAILABLE:
+    BODY_PARAGRAPHS = etree.XPath('/w:document/w:body/w:p', namespaces=W_NS)
+    RUN_CONTENT = etree.XPath(
+        '(w:r | w:hyperlink/w:r)/*[self::w:t or self::w:tab or self::w:cr'
+        ' or self::w:br[not(@w:type) or @w:type="textWrapping"]]',
+        namespaces=W_NS,
+    )
+    T_TAG = f"{{{W_NS['w']}}}t"
+    TAB_TAG = f"{{{W_NS['w']}}}tab"
+
+
+def _paragraph_text(para):
+    """Text of a <w:p> element: run text, with tabs and line breaks as characters."""
+    parts = []
+    for el in RUN_CONTENT(para):
+        if el.tag == T_TAG:
+            parts.append(el.text or '')
+        elif el.tag == TAB_TAG:
+            parts.append('\t')
+        else:
+            parts.append('\n')
+    return ''.join(parts)
+
 
 def read_docx(file_path):
     """Read Word document and extract all text."""
-    doc = Document(file_path)
-    
+    if not LXML_AVAILABLE:
+        from docx import Document
+        doc = Document(file_path)
+        paragraphs = (para.text for para in doc.paragraphs)
+    else:
+        # Parse word/document.xml directly; much faster than python-docx's
+        # per-paragraph object traversal on large documents
+        with zipfile.ZipFile(file_path) as z, z.open('word/document.xml') as f:
+            tree = etree.parse(f)
+        paragraphs = (_paragraph_text(p) for p in BODY_PARAGRAPHS(tree))
+
     text_content = []
-    for para in doc.paragraphs:
-        if para.text.strip():
-            text_content.append(para.text)
+    for text in paragraphs:
+        if text.strip():
+            text_content.append(text)
     
     return '\n'.join(text_content)
 
@@ -2,33 +2,264 @@
 """
 Simple test script for LangGraph RIA workflow.
 Handles missing dependencies gracefully.
+
+Usage: python test_langgraph_simple.py [--quiet | --verbose | --json-only]
+  --quiet      Only write the result file (no summary or sample content)
+  --verbose    Also list the report's sections and sources, and always show sample content
+  --json-only  Print the result JSON to stdout (progress goes to stderr)
 """
 
-import asyncio
+import io
 import sys
-from pathlib import Path
+from datetime import date, datetime
+from importlib.util import find_spec
+from itertools import islice
+from pathlib import PurePath
 
-# Check for langgraph
-try:
-    from langgraph.graph import StateGraph, END
-    LANGGRAPH_AVAILABLE = True
-except ImportError:
-    LANGGRAPH_AVAILABLE = False
+# --json-only keeps stdout for the result JSON: everything printed (including the
+# backend's import-time messages) goes to stderr instead
+JSON_ONLY = __name__ == "__main__" and "--json-only" in sys.argv[1:]
+if JSON_ONLY:
+    _json_stdout, sys.stdout = sys.stdout, sys.stderr
+
+# Check for langgraph (locating the package is enough; the workflow imports it)
+LANGGRAPH_AVAILABLE = find_spec("langgraph") is not None
+if not LANGGRAPH_AVAILABLE:
     print("⚠️  LangGraph not installed.")
     print("   Install with: pip install langgraph typing-extensions")
     print("   Or: uv add langgraph typing-extensions")
     sys.exit(1)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 # Try to import the workflow
 try:
-    from backend.ria_langgraph import run_ria_workflow
+    from backend.ria_langgraph import prefetch_resources, run_ria_workflow_stream
+    from backend.http_client import close_http_client
 except ImportError as e:
     print(f"❌ Error importing workflow: {e}")
     sys.exit(1)
 
 
-async def main():
-    """Test the LangGraph workflow with a sample proposal."""
+# Result keys shown in the summary, with the value used when a key is missing
+_RESULT_DEFAULTS = (
+    ("retrieval_strategy", "unknown"),
+    ("vector_results", ()),
+    ("graph_results", ()),
+    ("merged_chunks", ()),
+    ("features", None),
+    ("final_report", None),
+    ("quality_metrics", None),
+    ("stage1_results", ()),
+    ("stage2_results", ()),
+    ("stage3_result", None),
+    ("errors", ()),
+    ("retry_count", 0),
+)
+
+
+def _print_summary(result, verbose=False):
+    """
+    Print the workflow path, report summary, metrics, council stages and errors.
+    
+    Args:
+        result: Final workflow state
+        verbose: Also list the filled sections and the first sources
+    """
+    # Built in memory and written once, rather than one print (and write) per line
+    buf = io.StringIO()
+    w = buf.write
+    
+    (strategy, vector_results, graph_results, merged_chunks, features, report, metrics,
+     stage1_results, stage2_results, stage3_result, errors, retry_count) = (
+        result.get(key, default) for key, default in _RESULT_DEFAULTS
+    )
+    
+    # Show workflow path taken
+    w(f"\n🛤️  Workflow Path:\n")
+    w(f"   Retrieval strategy: {strategy}\n")
+    
+    w(f"   Vector results: {len(vector_results)} chunks\n")
+    w(f"   Graph results: {len(graph_results)} chunks\n")
+    w(f"   Merged chunks: {len(merged_chunks)} chunks\n")
+    
+    # Show features extracted
+    if features:
+        w(f"\n🔍 Extracted Features:\n")
+        w(f"   Categories: {features.get('categories', [])}\n")
+        w(f"   Complexity: {features.get('complexity', 'unknown')}\n")
+        w(f"   Word count: {features.get('word_count', 0)}\n")
+    
+    # Show final report summary
+    if report is not None:
+        metadata = report.get("metadata", {})
+        
+        w(f"\n📊 Final Report Summary:\n")
+        w(f"   Model: {metadata.get('model', 'unknown')}\n")
+        w(f"   Generated at: {metadata.get('generated_at', 'unknown')}\n")
+        w(f"   Retrieval strategy: {metadata.get('retrieval_strategy', 'unknown')}\n")
+        w(f"   Chunks used: {metadata.get('chunks_used', 0)}\n")
+        
+        sections = report.get("sections", {})
+        sections_filled = sum(map(bool, sections.values()))
+        w(f"   Sections filled: {sections_filled}/{len(sections)}\n")
+        
+        if verbose and sections_filled > 0:
+            w(f"\n   Sections found:\n")
+            for section_name, section_content in sections.items():
+                if section_content:
+                    w(f"     ✅ {section_name}: {len(section_content)} chars\n")
+        
+        sources = report.get("sources", [])
+        w(f"   Sources: {len(sources)}\n")
+        
+        if verbose and sources:
+            w(f"\n📚 Sources Used:\n")
+            for i, source in enumerate(islice(sources, 5), 1):
+                w(f"   {i}. {source.get('document', 'Unknown')}\n")
+                w(f"      Jurisdiction: {source.get('jurisdiction', 'Unknown')}\n")
+                w(f"      Category: {source.get('category', 'Unknown')}\n")
+    
+    # Show quality metrics
+    if metrics is not None:
+        w(f"\n📈 Quality Metrics:\n")
+        
+        if "retrieval" in metrics:
+            retrieval = metrics["retrieval"]
+            w(f"   Retrieval:\n")
+            w(f"     - Chunks: {retrieval.get('chunk_count', 0)}\n")
+            w(f"     - Avg score: {retrieval.get('avg_score', 0):.3f}\n")
+            w(f"     - Quality OK: {'✅' if retrieval.get('quality_ok') else '❌'}\n")
+        
+        if "context" in metrics:
+            context_metrics = metrics["context"]
+            w(f"   Context:\n")
+            w(f"     - Length: {context_metrics.get('length', 0)} chars\n")
+            w(f"     - Chunk count: {context_metrics.get('chunk_count', 0)}\n")
+            w(f"     - Valid: {'✅' if context_metrics.get('is_valid') else '❌'}\n")
+        
+        if "council" in metrics:
+            council = metrics["council"]
+            w(f"   Council:\n")
+            w(f"     - Content length: {council.get('content_length', 0)} chars\n")
+            w(f"     - Valid: {'✅' if council.get('is_valid') else '❌'}\n")
+            w(f"     - Model: {council.get('model', 'unknown')}\n")
+        
+        if "overall" in metrics:
+            overall = metrics["overall"]
+            w(f"   Overall:\n")
+            w(f"     - Completeness: {overall.get('completeness', 0):.2%}\n")
+            w(f"     - Sections filled: {overall.get('sections_filled', 0)}/{overall.get('total_sections', 0)}\n")
+            w(f"     - Sources: {overall.get('sources_count', 0)}\n")
+    
+    # Show council stages
+    if stage1_results or stage2_results or stage3_result:
+        w(f"\n🤖 Council Stages:\n")
+        w(f"   Stage 1: {len(stage1_results)} opinions generated\n")
+        w(f"   Stage 2: {len(stage2_results)} rankings collected\n")
+        if stage3_result:
+            w(f"   Stage 3: ✅ Final synthesis complete\n")
+            w(f"      Model: {stage3_result.get('model', 'unknown')}\n")
+    
+    # Show errors if any
+    if errors:
+        w(f"\n⚠️  Errors encountered: {len(errors)}\n")
+        for error in errors:
+            w(f"   - {error.get('message', 'Unknown error')}\n")
+            w(f"     Time: {error.get('timestamp', 'unknown')}\n")
+    else:
+        w(f"\n✅ No errors encountered\n")
+    
+    # Show retry count
+    if retry_count > 0:
+        w(f"\n🔄 Retries: {retry_count} expansion/retry cycles\n")
+    
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+
+
+def _print_sample_content(result):
+    """Print the start of the generated report."""
+    # Show sample content
+    if "final_report" in result:
+        report = result["final_report"]
+        content = report.get("content", "")
+        if content:
+            print(f"\n📄 Sample Content (first 800 chars):")
+            print("-" * 60)
+            sys.stdout.write(content[:800] + "\n")
+            if len(content) > 800:
+                print("...")
+            print("-" * 60)
+
+
+# Types already reported by _json_default (warned about once each)
+_unknown_json_types = set()
+
+
+def _json_default(obj):
+    """
+    Convert the non-JSON values a workflow result can hold (numpy arrays and
+    scalars from retrieval scores, datetimes, paths, sets).
+    
+    Any other type is written as its str(), with a warning naming the type, so
+    the result of a long run is still saved.
+    """
+    if NUMPY_AVAILABLE:
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, PurePath):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    type_name = f"{type(obj).__module__}.{type(obj).__qualname__}"
+    if type_name not in _unknown_json_types:
+        _unknown_json_types.add(type_name)
+        print(f"⚠️  Result contains a {type_name}; saving its str() instead", file=sys.stderr)
+    return str(obj)
+
+
+def _result_json(result) -> bytes:
+    """Serialize the workflow result as indented UTF-8 JSON."""
+    if ORJSON_AVAILABLE:
+        # orjson handles numpy and datetimes natively; the rest go through _json_default
+        return orjson.dumps(
+            result,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            default=_json_default
+        )
+    import json
+    return json.dumps(result, indent=2, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+async def main(quiet: bool = False, verbose: bool = False):
+    """
+    Test the LangGraph workflow with a sample proposal.
+    
+    Args:
+        quiet: Skip the result summary and sample content (the result file is still written)
+        verbose: List the report's sections and sources, and show sample content
+            even when stdout is not a terminal
+    
+    Returns:
+        Final workflow state, or None if the workflow failed
+    """
+    import asyncio
+    import os
     
     print("🧪 Testing LangGraph RIA Workflow")
     print("=" * 60)
@@ -52,8 +283,14 @@ async def main():
     
     # Check prerequisites
     print(f"\n🔍 Checking prerequisites...")
-    vector_store_exists = Path("vector_store").exists()
-    knowledge_graph_exists = Path("knowledge_graph.pkl").exists()
+    # One directory read instead of a stat per prerequisite
+    existing = {entry.name for entry in os.scandir(".")}
+    vector_store_exists = "vector_store" in existing
+    knowledge_graph_exists = "knowledge_graph.pkl" in existing
+    
+    # Start loading the vector index and graph now, in background threads, so the
+    # load overlaps the rest of the setup instead of blocking the first retrieval
+    prefetch = asyncio.create_task(prefetch_resources("vector_store", "knowledge_graph.pkl"))
     
     print(f"   Vector store: {'✅ Found' if vector_store_exists else '⚠️  Not found (will skip vector retrieval)'}")
     print(f"   Knowledge graph: {'✅ Found' if knowledge_graph_exists else '⚠️  Not found (will skip graph retrieval)'}")
@@ -65,157 +302,48 @@ async def main():
         print("     python build_vector_store.py")
         print("     python build_knowledge_graph.py")
     
+    steps = 0
     try:
-        # Run workflow
+        # Run workflow, streaming the state as each node finishes (nodes print
+        # their own progress, so output appears step by step)
         print(f"\n🚀 Starting workflow...")
         print("   (This may take a few minutes depending on LLM API response times)")
         print()
         
-        result = await run_ria_workflow(
+        await prefetch
+        result = {}
+        async for state in run_ria_workflow_stream(
             proposal=proposal,
             context=context,
             vector_store_path="vector_store",
             knowledge_graph_path="knowledge_graph.pkl"
-        )
+        ):
+            result = state
+            steps += 1
         
-        # Display results
         print("\n" + "=" * 60)
-        print("✅ Workflow Complete!")
+        print(f"✅ Workflow Complete! ({steps} steps)")
         print("=" * 60)
         
-        # Show workflow path taken
-        print(f"\n🛤️  Workflow Path:")
-        strategy = result.get("retrieval_strategy", "unknown")
-        print(f"   Retrieval strategy: {strategy}")
-        
-        vector_results = result.get("vector_results", [])
-        graph_results = result.get("graph_results", [])
-        merged_chunks = result.get("merged_chunks", [])
-        
-        print(f"   Vector results: {len(vector_results)} chunks")
-        print(f"   Graph results: {len(graph_results)} chunks")
-        print(f"   Merged chunks: {len(merged_chunks)} chunks")
-        
-        # Show features extracted
-        features = result.get("features", {})
-        if features:
-            print(f"\n🔍 Extracted Features:")
-            print(f"   Categories: {features.get('categories', [])}")
-            print(f"   Complexity: {features.get('complexity', 'unknown')}")
-            print(f"   Word count: {features.get('word_count', 0)}")
-        
-        # Show final report summary
-        if "final_report" in result:
-            report = result["final_report"]
-            metadata = report.get("metadata", {})
-            
-            print(f"\n📊 Final Report Summary:")
-            print(f"   Model: {metadata.get('model', 'unknown')}")
-            print(f"   Generated at: {metadata.get('generated_at', 'unknown')}")
-            print(f"   Retrieval strategy: {metadata.get('retrieval_strategy', 'unknown')}")
-            print(f"   Chunks used: {metadata.get('chunks_used', 0)}")
-            
-            sections = report.get("sections", {})
-            sections_filled = len([s for s in sections.values() if s])
-            print(f"   Sections filled: {sections_filled}/{len(sections)}")
-            
-            if sections_filled > 0:
-                print(f"\n   Sections found:")
-                for section_name, section_content in sections.items():
-                    if section_content:
-                        print(f"     ✅ {section_name}: {len(section_content)} chars")
-            
-            sources = report.get("sources", [])
-            print(f"   Sources: {len(sources)}")
-            
-            if sources:
-                print(f"\n📚 Sources Used:")
-                for i, source in enumerate(sources[:5], 1):
-                    print(f"   {i}. {source.get('document', 'Unknown')}")
-                    print(f"      Jurisdiction: {source.get('jurisdiction', 'Unknown')}")
-                    print(f"      Category: {source.get('category', 'Unknown')}")
-        
-        # Show quality metrics
-        if "quality_metrics" in result:
-            metrics = result["quality_metrics"]
-            print(f"\n📈 Quality Metrics:")
-            
-            if "retrieval" in metrics:
-                retrieval = metrics["retrieval"]
-                print(f"   Retrieval:")
-                print(f"     - Chunks: {retrieval.get('chunk_count', 0)}")
-                print(f"     - Avg score: {retrieval.get('avg_score', 0):.3f}")
-                print(f"     - Quality OK: {'✅' if retrieval.get('quality_ok') else '❌'}")
-            
-            if "context" in metrics:
-                context_metrics = metrics["context"]
-                print(f"   Context:")
-                print(f"     - Length: {context_metrics.get('length', 0)} chars")
-                print(f"     - Chunk count: {context_metrics.get('chunk_count', 0)}")
-                print(f"     - Valid: {'✅' if context_metrics.get('is_valid') else '❌'}")
-            
-            if "council" in metrics:
-                council = metrics["council"]
-                print(f"   Council:")
-                print(f"     - Content length: {council.get('content_length', 0)} chars")
-                print(f"     - Valid: {'✅' if council.get('is_valid') else '❌'}")
-                print(f"     - Model: {council.get('model', 'unknown')}")
-            
-            if "overall" in metrics:
-                overall = metrics["overall"]
-                print(f"   Overall:")
-                print(f"     - Completeness: {overall.get('completeness', 0):.2%}")
-                print(f"     - Sections filled: {overall.get('sections_filled', 0)}/{overall.get('total_sections', 0)}")
-                print(f"     - Sources: {overall.get('sources_count', 0)}")
-        
-        # Show council stages
-        stage1_results = result.get("stage1_results", [])
-        stage2_results = result.get("stage2_results", [])
-        stage3_result = result.get("stage3_result", {})
-        
-        if stage1_results or stage2_results or stage3_result:
-            print(f"\n🤖 Council Stages:")
-            print(f"   Stage 1: {len(stage1_results)} opinions generated")
-            print(f"   Stage 2: {len(stage2_results)} rankings collected")
-            if stage3_result:
-                print(f"   Stage 3: ✅ Final synthesis complete")
-                print(f"      Model: {stage3_result.get('model', 'unknown')}")
-        
-        # Show errors if any
-        if "errors" in result and result["errors"]:
-            print(f"\n⚠️  Errors encountered: {len(result['errors'])}")
-            for error in result["errors"]:
-                print(f"   - {error.get('message', 'Unknown error')}")
-                print(f"     Time: {error.get('timestamp', 'unknown')}")
-        else:
-            print(f"\n✅ No errors encountered")
-        
-        # Show retry count
-        retry_count = result.get("retry_count", 0)
-        if retry_count > 0:
-            print(f"\n🔄 Retries: {retry_count} expansion/retry cycles")
+        if not quiet:
+            _print_summary(result, verbose)
         
         # Save result to file
         output_file = "test_langgraph_result.json"
-        import json
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False, default=str)
+        # Serialize before opening, so a failure can't leave the file truncated
+        data = _result_json(result)
+        with open(output_file, 'wb') as f:
+            f.write(data)
         print(f"\n💾 Full result saved to: {output_file}")
         
-        # Show sample content
-        if "final_report" in result:
-            report = result["final_report"]
-            content = report.get("content", "")
-            if content:
-                print(f"\n📄 Sample Content (first 800 chars):")
-                print("-" * 60)
-                print(content[:800])
-                if len(content) > 800:
-                    print("...")
-                print("-" * 60)
+        # Sample content is for reading at a terminal; skip it in captured logs
+        if not quiet and (verbose or sys.stdout.isatty()):
+            _print_sample_content(result)
+        
+        return result
         
     except Exception as e:
-        print(f"\n❌ Error running workflow: {e}")
+        print(f"\n❌ Error running workflow after {steps} steps: {e}")
         import traceback
         traceback.print_exc()
         print("\n💡 Troubleshooting:")
@@ -223,7 +351,23 @@ async def main():
         print("   2. Check that vector_store or knowledge_graph.pkl exist")
         print("   3. Verify OpenRouter API key is set in .env file")
         print("   4. Check network connectivity for LLM API calls")
+    finally:
+        # LLM requests share one HTTP client (kept-alive connections); close it
+        await close_http_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop's event loop (installed with uvicorn[standard]) when available
+    try:
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+    
+    flags = set(sys.argv[1:])
+    if JSON_ONLY:
+        result = run(main(quiet=True))
+        if result is None:
+            sys.exit(1)
+        _json_stdout.buffer.write(_result_json(result) + b"\n")
+    else:
+        run(main(quiet="--quiet" in flags, verbose="--verbose" in flags))